@@ -1,10 +1,5 @@
-import copy
 import game as gamex
-import matplotlib.pyplot
-import networkx
 import numpy
-import pygame
-import random
 
 NUM_INPUTS_PER_BUFFALO = 3 # X, Y, direction.
 NUM_BUFFALO_TO_TRACK = 5
@@ -15,116 +10,236 @@ NUM_OUTPUTS = 6 # WSAD + ENTER + SPACE.
 NUM_HIDDEN_LAYERS = 1
 NUM_NEURONS_PER_LAYER = round((NUM_INPUTS + NUM_OUTPUTS) * 2 / 3)
 
-class Brain:
-    def __init__(self):
-        # WARNING! Magic number! This 0.125 is a random guess. But this brain's
-        # probability of mutation itself can mutate. Over generations,
-        # this value may grow or shrink and eventually converge on an optimal number.
-        self._probability_of_mutation = 0.125
+# Mutation draws come from one shared generator unless the caller passes their own.
+_default_rng = numpy.random.default_rng()
+
+# Every brain parameter lives in one flat float32 genome. Element 0 is the probability of mutation, and the rest are
+# these arrays, in this order, each flattened. Brains see their arrays as reshaped views into the genome, so a
+# brain is cloned with one copy, and a whole population of genomes is one (population size, GENOME_LENGTH) array.
+_GENOME_ARRAY_NAMES_SHAPES = [
+    ("_input_layer_edge_weights", (NUM_INPUTS, NUM_NEURONS_PER_LAYER)),
+    ("_input_biases", (NUM_NEURONS_PER_LAYER,)),
+    ("_hidden_layer_edge_weights", (NUM_NEURONS_PER_LAYER, NUM_NEURONS_PER_LAYER, NUM_HIDDEN_LAYERS)),
+    ("_hidden_biases", (NUM_NEURONS_PER_LAYER, NUM_HIDDEN_LAYERS)),
+    ("_output_layer_edge_weights", (NUM_NEURONS_PER_LAYER, NUM_OUTPUTS)),
+    ("_output_biases", (NUM_OUTPUTS,)),
+]
+
+# Each array's (name, shape, begin, end) within the genome.
+def _genome_layout():
+    layout = []
+    begin = 1
+    for name, shape in _GENOME_ARRAY_NAMES_SHAPES:
+        end = begin + int(numpy.prod(shape))
+        layout.append((name, shape, begin, end))
+        begin = end
+
+    return layout
+
+_GENOME_LAYOUT = _genome_layout()
+
+GENOME_LENGTH = _GENOME_LAYOUT[-1][3]
+GENOME_DTYPE = numpy.float32
+
+def compute_input_values(game_state):
+    # The game keeps its sensors up to date as it ticks, so this only has to pick the nearest rows.
+    sensors = game_state.sensors
+    offsets, nearest_buffalos_rows, nearest_obstacles_rows = sensors.nearest(
+        game_state.hunter.rect.center, NUM_BUFFALO_TO_TRACK, NUM_OBSTACLES_TO_TRACK
+    )
+
+    input_values = numpy.zeros(NUM_INPUTS)
+
+    num_buffalos = len(nearest_buffalos_rows)
+    buffalos_segments = input_values[:NUM_INPUTS_PER_BUFFALO * num_buffalos].reshape(num_buffalos, NUM_INPUTS_PER_BUFFALO)
+    buffalos_segments[:, 0:2] = offsets[nearest_buffalos_rows]
+    buffalos_segments[:, 2] = sensors.directions[nearest_buffalos_rows]
+
+    # WARNING! Obstacle segments overlap, because this stride is NUM_OBSTACLES_TO_TRACK rather than NUM_INPUTS_PER_OBSTACLE.
+    # Brains have been trained on it, so keep it, and fill the segments one at a time, in order.
+    for obstacle_index, row in enumerate(nearest_obstacles_rows.tolist()):
+        segment_begin = NUM_INPUTS_PER_BUFFALO * NUM_BUFFALO_TO_TRACK + NUM_OBSTACLES_TO_TRACK * obstacle_index
+
+        input_values[segment_begin + 0:segment_begin + 2] = offsets[row]
+        input_values[segment_begin + 2:segment_begin + 4] = sensors.sizes[row]
+
+    return input_values
+
+# Same as `numpy.array([compute_input_values(game) for game in games])`, but queries every game's sensors
+# in one pass: all the games' rows are stacked, then sorted by game and distance together.
+def compute_games_input_values(games):
+    all_sensors = [game.sensors for game in games]
+    centers = numpy.concatenate([sensors.centers[:sensors.num_rows] for sensors in all_sensors])
+    sizes = numpy.concatenate([sensors.sizes[:sensors.num_rows] for sensors in all_sensors])
+    directions = numpy.concatenate([sensors.directions[:sensors.num_rows] for sensors in all_sensors])
+    alive = numpy.concatenate([sensors.alive[:sensors.num_rows] for sensors in all_sensors])
+    obstacle = numpy.concatenate([sensors.obstacle[:sensors.num_rows] for sensors in all_sensors])
+    rows_games = numpy.repeat(numpy.arange(len(games)), [sensors.num_rows for sensors in all_sensors])
+
+    hunters_centers = numpy.array([game.hunter.rect.center for game in games])
+    offsets = centers - hunters_centers[rows_games]
+    distances = numpy.einsum("ij,ij->i", offsets, offsets)
+
+    # `lexsort` is stable, so within a game, ties stay in row order, the same as `sorted`.
+    rows = numpy.lexsort((distances, rows_games))
+
+    input_values = numpy.zeros((len(games), NUM_INPUTS))
+
+    # Rank each row among its own game's rows of the same kind, and keep the nearest few.
+    def nearest_ranked(kind, k):
+        kind_rows = rows[kind[rows]]
+        kind_rows_games = rows_games[kind_rows]
+        ranks = numpy.arange(len(kind_rows)) - numpy.searchsorted(kind_rows_games, kind_rows_games)
+        return kind_rows[ranks < k], kind_rows_games[ranks < k], ranks[ranks < k]
+
+    buffalos_rows, buffalos_games, buffalos_ranks = nearest_ranked(alive, NUM_BUFFALO_TO_TRACK)
+    segments_begin = NUM_INPUTS_PER_BUFFALO * buffalos_ranks
+    input_values[buffalos_games, segments_begin + 0] = offsets[buffalos_rows, 0]
+    input_values[buffalos_games, segments_begin + 1] = offsets[buffalos_rows, 1]
+    input_values[buffalos_games, segments_begin + 2] = directions[buffalos_rows]
+
+    # Obstacle segments overlap, see `compute_input_values`, so fill them one rank at a time, in order.
+    obstacles_rows, obstacles_games, obstacles_ranks = nearest_ranked(obstacle, NUM_OBSTACLES_TO_TRACK)
+    for obstacle_index in range(NUM_OBSTACLES_TO_TRACK):
+        ranked = obstacles_ranks == obstacle_index
+        segment_begin = NUM_INPUTS_PER_BUFFALO * NUM_BUFFALO_TO_TRACK + NUM_OBSTACLES_TO_TRACK * obstacle_index
+
+        input_values[obstacles_games[ranked], segment_begin + 0] = offsets[obstacles_rows[ranked], 0]
+        input_values[obstacles_games[ranked], segment_begin + 1] = offsets[obstacles_rows[ranked], 1]
+        input_values[obstacles_games[ranked], segment_begin + 2] = sizes[obstacles_rows[ranked], 0]
+        input_values[obstacles_games[ranked], segment_begin + 3] = sizes[obstacles_rows[ranked], 1]
+
+    return input_values
+
+# Same inputs as `compute_input_values`, but for every game of a `BatchGame` at once,
+# as a (N, NUM_INPUTS) array ready for `Population.compute_next_moves`.
+def compute_batch_input_values(batch_game):
+    # `pygame.Rect.center` rounds half sizes down.
+    hunter_center_x = batch_game.hunter_x + gamex.Hunter.width // 2
+    hunter_center_y = batch_game.hunter_y + gamex.Hunter.height // 2
+
+    input_values = numpy.zeros((batch_game.n, NUM_INPUTS))
+    games = numpy.arange(batch_game.n)
+
+    # Rank by squared distance, which orders the same as distance. Stable sorts keep ties in list order,
+    # the same as `sorted` does.
+    buffalos_offset_x = batch_game.buffalo_x + gamex.Buffalo.width // 2 - hunter_center_x[:, numpy.newaxis]
+    buffalos_offset_y = batch_game.buffalo_y + gamex.Buffalo.height // 2 - hunter_center_y[:, numpy.newaxis]
+    living_buffalos_distances = numpy.where(
+        batch_game.buffalo_alive, buffalos_offset_x ** 2 + buffalos_offset_y ** 2, numpy.iinfo(numpy.int64).max
+    )
+    nearest_buffalos = numpy.argsort(living_buffalos_distances, axis = 1, kind = "stable")[:, :NUM_BUFFALO_TO_TRACK]
+    nearest_buffalos_alive = batch_game.buffalo_alive[games[:, numpy.newaxis], nearest_buffalos]
+    for buffalo_index in range(min(NUM_BUFFALO_TO_TRACK, nearest_buffalos.shape[1])):
+        segment_begin = NUM_INPUTS_PER_BUFFALO * buffalo_index
+        slots = nearest_buffalos[:, buffalo_index]
+        alive = nearest_buffalos_alive[:, buffalo_index]
+
+        input_values[:, segment_begin + 0] = numpy.where(alive, buffalos_offset_x[games, slots], 0)
+        input_values[:, segment_begin + 1] = numpy.where(alive, buffalos_offset_y[games, slots], 0)
+        input_values[:, segment_begin + 2] = numpy.where(alive, batch_game.buffalo_direction[games, slots], 0)
+
+    # Obstacles, then invisible walls, then dead buffalo, the same list order as `compute_input_values`.
+    num_walls = len(gamex.INVISIBLE_WALLS)
+    obstacles_x = numpy.concatenate([
+        batch_game.obstacles_x,
+        numpy.broadcast_to([wall.x for wall in gamex.INVISIBLE_WALLS], (batch_game.n, num_walls)),
+        batch_game.buffalo_x,
+    ], axis = 1)
+    obstacles_y = numpy.concatenate([
+        batch_game.obstacles_y,
+        numpy.broadcast_to([wall.y for wall in gamex.INVISIBLE_WALLS], (batch_game.n, num_walls)),
+        batch_game.buffalo_y,
+    ], axis = 1)
+    obstacles_width = numpy.concatenate([
+        numpy.full(batch_game.obstacles_x.shape, 80),
+        numpy.broadcast_to([wall.width for wall in gamex.INVISIBLE_WALLS], (batch_game.n, num_walls)),
+        numpy.full(batch_game.buffalo_x.shape, gamex.Buffalo.width),
+    ], axis = 1)
+    obstacles_height = numpy.concatenate([
+        numpy.full(batch_game.obstacles_x.shape, 80),
+        numpy.broadcast_to([wall.height for wall in gamex.INVISIBLE_WALLS], (batch_game.n, num_walls)),
+        numpy.full(batch_game.buffalo_x.shape, gamex.Buffalo.height),
+    ], axis = 1)
+    obstacles_present = numpy.concatenate([
+        numpy.ones((batch_game.n, batch_game.obstacles_x.shape[1] + num_walls), dtype = bool),
+        batch_game.buffalo_spawned() & ~batch_game.buffalo_alive,
+    ], axis = 1)
+
+    obstacles_offset_x = obstacles_x + obstacles_width // 2 - hunter_center_x[:, numpy.newaxis]
+    obstacles_offset_y = obstacles_y + obstacles_height // 2 - hunter_center_y[:, numpy.newaxis]
+    obstacles_distances = numpy.where(
+        obstacles_present, obstacles_offset_x ** 2 + obstacles_offset_y ** 2, numpy.iinfo(numpy.int64).max
+    )
+    nearest_obstacles = numpy.argsort(obstacles_distances, axis = 1, kind = "stable")[:, :NUM_OBSTACLES_TO_TRACK]
+    for obstacle_index in range(NUM_OBSTACLES_TO_TRACK):
+        # WARNING! Segments overlap, because this stride matches `compute_input_values`, which the brains were trained on.
+        segment_begin = NUM_INPUTS_PER_BUFFALO * NUM_BUFFALO_TO_TRACK + NUM_OBSTACLES_TO_TRACK * obstacle_index
+        slots = nearest_obstacles[:, obstacle_index]
+        present = obstacles_present[games, slots]
+
+        input_values[:, segment_begin + 0] = numpy.where(present, obstacles_offset_x[games, slots], 0)
+        input_values[:, segment_begin + 1] = numpy.where(present, obstacles_offset_y[games, slots], 0)
+        input_values[:, segment_begin + 2] = numpy.where(present, obstacles_width[games, slots], 0)
+        input_values[:, segment_begin + 3] = numpy.where(present, obstacles_height[games, slots], 0)
+
+    return input_values
 
-        self._input_values = numpy.zeros(NUM_INPUTS)
+class Brain:
+    # No per-brain dict. A population can be a lot of brains.
+    __slots__ = ["genome", "_input_values", "_output_values"] + [name for name, shape in _GENOME_ARRAY_NAMES_SHAPES]
 
-        self._input_layer_edge_weights = numpy.zeros((NUM_INPUTS, NUM_NEURONS_PER_LAYER))
-        self._input_biases = numpy.zeros(NUM_NEURONS_PER_LAYER)
+    # Wraps `genome`, if given, without copying it, such as one row of a whole population's genomes.
+    def __init__(self, genome = None):
+        if genome is None:
+            genome = numpy.zeros(GENOME_LENGTH, dtype = GENOME_DTYPE)
 
-        self._hidden_layer_edge_weights = numpy.zeros((NUM_NEURONS_PER_LAYER, NUM_NEURONS_PER_LAYER, NUM_HIDDEN_LAYERS))
-        self._hidden_biases = numpy.zeros((NUM_NEURONS_PER_LAYER, NUM_HIDDEN_LAYERS))
+            # WARNING! Magic number! This 0.125 is a random guess. But this brain's
+            # probability of mutation itself can mutate. Over generations,
+            # this value may grow or shrink and eventually converge on an optimal number.
+            genome[0] = 0.125
 
-        self._output_layer_edge_weights = numpy.zeros((NUM_NEURONS_PER_LAYER, NUM_OUTPUTS))
-        self._output_biases = numpy.zeros(NUM_OUTPUTS)
+        self.genome = genome
+        for name, shape, begin, end in _GENOME_LAYOUT:
+            setattr(self, name, genome[begin:end].reshape(shape))
 
+        self._input_values = numpy.zeros(NUM_INPUTS)
         self._output_values = numpy.zeros(NUM_OUTPUTS)
 
-    def mutate(self):
-        # Mutate and return a *copy*. The self object remains unchanged.
-        self_copy = copy.deepcopy(self)
+    @property
+    def _probability_of_mutation(self):
+        return float(self.genome[0])
 
-        if random.random() < self_copy._probability_of_mutation:
-            self_copy._probability_of_mutation = max(0.001, min(1,
-                self_copy._probability_of_mutation + random.gauss(0.0, 0.025)
-            ))
+    @_probability_of_mutation.setter
+    def _probability_of_mutation(self, probability_of_mutation):
+        self.genome[0] = probability_of_mutation
 
-        for input_index in range(NUM_INPUTS):
-            for neuron_index in range(NUM_NEURONS_PER_LAYER):
-                if random.random() < self_copy._probability_of_mutation:
-                    self_copy._input_layer_edge_weights[input_index, neuron_index] += random.gauss()
+    # Pickle and copy only the genome. The arrays are views into it, and would otherwise each be copied separately.
+    def __reduce__(self):
+        return (Brain, (self.genome,))
 
-        for neuron_index in range(NUM_NEURONS_PER_LAYER):
-            if random.random() < self_copy._probability_of_mutation:
-                self_copy._input_biases[neuron_index] += random.gauss()
+    def clone(self):
+        return Brain(self.genome.copy())
 
-        for neuron_index_lhs in range(NUM_NEURONS_PER_LAYER):
-            for neuron_index_rhs in range(NUM_NEURONS_PER_LAYER):
-                for hidden_layer_index in range(NUM_HIDDEN_LAYERS):
-                    if random.random() < self_copy._probability_of_mutation:
-                        self_copy._hidden_layer_edge_weights[neuron_index_lhs, neuron_index_rhs, hidden_layer_index] += random.gauss()
+    def mutate(self, rng = None):
+        rng = rng if rng is not None else _default_rng
 
-        for neuron_index in range(NUM_NEURONS_PER_LAYER):
-            for hidden_layer_index in range(NUM_HIDDEN_LAYERS):
-                if random.random() < self_copy._probability_of_mutation:
-                    self_copy._hidden_biases[neuron_index, hidden_layer_index] += random.gauss()
+        # Mutate and return a *copy*. The self object remains unchanged.
+        self_copy = self.clone()
 
-        for neuron_index in range(NUM_NEURONS_PER_LAYER):
-            for output_index in range(NUM_OUTPUTS):
-                if random.random() < self_copy._probability_of_mutation:
-                    self_copy._output_layer_edge_weights[neuron_index, output_index] += random.gauss()
+        if rng.random() < self_copy._probability_of_mutation:
+            self_copy._probability_of_mutation = max(0.001, min(1,
+                self_copy._probability_of_mutation + rng.normal(0.0, 0.025)
+            ))
 
-        for output_index in range(NUM_OUTPUTS):
-            if random.random() < self_copy._probability_of_mutation:
-                self_copy._output_biases[output_index] += random.gauss()
+        # Draw the mask and noise for every weight at once, rather than one weight at a time.
+        weights = self_copy.genome[1:]
+        weights += (rng.random(weights.shape) < self_copy._probability_of_mutation) * rng.standard_normal(weights.shape, dtype = GENOME_DTYPE)
 
         return self_copy
 
     def compute_next_move(self, game_state, logger = None):
-        living_buffalos_distances = [
-            (
-                buffalo,
-                (
-                    (buffalo.rect.centerx - game_state.hunter.rect.centerx) ** 2
-                    + (buffalo.rect.centery - game_state.hunter.rect.centery) ** 2
-                ) ** 0.5
-            )
-                for buffalo in filter(lambda buffalo: buffalo.alive, game_state.buffalos)
-        ]
-        living_buffalos_distances_sorted = sorted(living_buffalos_distances, key = lambda buffalo_distance: buffalo_distance[1])
-
-        all_obstacles = (
-            game_state.obstacles
-            + gamex.INVISIBLE_WALLS
-            + [buffalo.rect for buffalo in game_state.buffalos if not buffalo.alive]
-        )
-        obstacles_distances = [
-            (
-                obstacle,
-                (
-                    (obstacle.centerx - game_state.hunter.rect.centerx) ** 2
-                    + (obstacle.centery - game_state.hunter.rect.centery) ** 2
-                ) ** 0.5
-            )
-                for obstacle in all_obstacles
-        ]
-        obstacles_distances_sorted = sorted(obstacles_distances, key = lambda obstacle_distance: obstacle_distance[1])
-
-        for input_index in range(NUM_INPUTS):
-            self._input_values[input_index] = 0
-
-        for buffalo_index in range(min(NUM_BUFFALO_TO_TRACK, len(living_buffalos_distances_sorted))):
-            buffalo_distance = living_buffalos_distances_sorted[buffalo_index]
-            buffalo = buffalo_distance[0]
-            segment_begin = NUM_INPUTS_PER_BUFFALO * buffalo_index
-
-            self._input_values[segment_begin + 0] = buffalo.rect.centerx - game_state.hunter.rect.centerx
-            self._input_values[segment_begin + 1] = buffalo.rect.centery - game_state.hunter.rect.centery
-            self._input_values[segment_begin + 2] = buffalo.direction
-        for obstacle_index in range(min(NUM_OBSTACLES_TO_TRACK, len(obstacles_distances_sorted))):
-            obstacle_distance = obstacles_distances_sorted[obstacle_index]
-            obstacle = obstacle_distance[0]
-            segment_begin = NUM_INPUTS_PER_BUFFALO * NUM_BUFFALO_TO_TRACK + NUM_OBSTACLES_TO_TRACK * obstacle_index
-
-            self._input_values[segment_begin + 0] = obstacle.centerx - game_state.hunter.rect.centerx
-            self._input_values[segment_begin + 1] = obstacle.centery - game_state.hunter.rect.centery
-            self._input_values[segment_begin + 2] = obstacle.width
-            self._input_values[segment_begin + 3] = obstacle.height
+        self._input_values = compute_input_values(game_state)
 
         layer_neuron_values = list(map(
             lambda value: max(0, value),
@@ -159,93 +274,94 @@ class Brain:
             logger.write("OUTPUT LAYER BIASES:\n" + str(self._output_biases) + "\n\n")
             logger.write("OUTPUT VALUES:\n" + str(self._output_values) + "\n\n")
 
-        return dict([
-            (pygame.K_w, self._output_values[0] > 0),
-            (pygame.K_s, self._output_values[1] > 0),
-            (pygame.K_a, self._output_values[2] > 0),
-            (pygame.K_d, self._output_values[3] > 0),
-            (pygame.K_RETURN, self._output_values[4] > 0),
-            (pygame.K_SPACE, self._output_values[5] > 0),
-        ])
-
-    def render(self):
-        graph = networkx.DiGraph()
-
-        # Inputs.
-        node_column = 0
-        for input_index in range(NUM_INPUTS):
-            node_id = f"x_{node_column}_y_{input_index}"
-            graph.add_node(node_id, pos = (node_column, input_index))
-
-        # Input layer.
-        node_column += 1
-        for neuron_index in range(NUM_NEURONS_PER_LAYER):
-            node_id = f"x_{node_column}_y_{neuron_index}"
-            graph.add_node(node_id, pos = (node_column, neuron_index / NUM_NEURONS_PER_LAYER * NUM_INPUTS))
-        for input_index in range(NUM_INPUTS):
-            node_id_lhs = f"x_{node_column - 1}_y_{input_index}"
-            for neuron_index in range(NUM_NEURONS_PER_LAYER):
-                node_id_rhs = f"x_{node_column}_y_{neuron_index}"
-                graph.add_edge(node_id_lhs, node_id_rhs, weight = self._input_layer_edge_weights[input_index][neuron_index])
-
-        # Hidden layers.
-        for hidden_layer_index in range(NUM_HIDDEN_LAYERS):
-            node_column += 1
-            for neuron_index in range(NUM_NEURONS_PER_LAYER):
-                node_id = f"x_{node_column}_y_{neuron_index}"
-                graph.add_node(node_id, pos = (node_column, neuron_index / NUM_NEURONS_PER_LAYER * NUM_INPUTS))
-            for neuron_index_lhs in range(NUM_NEURONS_PER_LAYER):
-                node_id_lhs = f"x_{node_column - 1}_y_{neuron_index_lhs}"
-                for neuron_index_rhs in range(NUM_NEURONS_PER_LAYER):
-                    node_id_rhs = f"x_{node_column}_y_{neuron_index_rhs}"
-                    graph.add_edge(
-                        node_id_lhs,
-                        node_id_rhs,
-                        weight = self._hidden_layer_edge_weights[neuron_index_lhs][neuron_index_rhs][hidden_layer_index]
-                    )
-
-        # Output layer.
-        node_column += 1
-        for output_index in range(NUM_OUTPUTS):
-            node_id = f"x_{node_column}_y_{output_index}"
-            graph.add_node(node_id, pos = (node_column, output_index / NUM_OUTPUTS * NUM_INPUTS))
-        for neuron_index in range(NUM_NEURONS_PER_LAYER):
-            node_id_lhs = f"x_{node_column - 1}_y_{neuron_index}"
-            for output_index in range(NUM_OUTPUTS):
-                node_id_rhs = f"x_{node_column}_y_{output_index}"
-                graph.add_edge(node_id_lhs, node_id_rhs, weight = self._output_layer_edge_weights[neuron_index][output_index])
-
-        figure = matplotlib.pyplot.figure(figsize = (9.6, 5.4), layout = "constrained")
-        figure_axes = figure.gca()
-        networkx.draw_networkx_nodes(
-            graph,
-            networkx.get_node_attributes(graph, "pos"),
-            ax = figure_axes,
-            node_size = 200,
-            node_color = "blue",
-            alpha = 0.35,
+        return gamex.actions_from_moves([self._output_values > 0])[0]
+
+    # Every edge's weight, from the inputs to the outputs, a layer at a time. Within a layer, edges are ordered by
+    # the neuron they leave, then the neuron they enter.
+    def edge_weights(self):
+        return numpy.concatenate(
+            [self._input_layer_edge_weights.ravel()]
+            + [self._hidden_layer_edge_weights[:, :, hidden_layer_index].ravel() for hidden_layer_index in range(NUM_HIDDEN_LAYERS)]
+            + [self._output_layer_edge_weights.ravel()]
         )
-        edges_weights_to_render = [
-            (edge, weight)
-                for edge, weight in networkx.get_edge_attributes(graph, "weight").items()
-                if weight != 0
-        ]
-        networkx.draw_networkx_edges(
-            graph,
-            networkx.get_node_attributes(graph, "pos"),
-            ax = figure_axes,
-            edgelist = list(map(lambda edge_weight: edge_weight[0], edges_weights_to_render)),
-            edge_color = list(map(lambda edge_weight: edge_weight[1], edges_weights_to_render)),
-            edge_cmap = matplotlib.pyplot.cm.Blues,
+
+# Make a whole next generation in a few array operations. Child `index` is a mutated copy of
+# `parents[index % len(parents)]`, the same assignment the training loop used when it called `mutate` per child.
+def mutate_population(parents, n_children, rng = None):
+    rng = rng if rng is not None else _default_rng
+
+    # Fancy indexing copies, so the parents remain unchanged.
+    genomes = stack_genomes(parents)[numpy.arange(n_children) % len(parents)]
+
+    probabilities = genomes[:, 0]
+    probabilities_mutating = rng.random(n_children) < probabilities
+    probabilities[:] = numpy.where(
+        probabilities_mutating,
+        numpy.clip(probabilities + rng.normal(0.0, 0.025, n_children), 0.001, 1),
+        probabilities
+    )
+
+    # Broadcast each child's own probability across all of that child's weights.
+    weights = genomes[:, 1:]
+    weights += (rng.random(weights.shape) < probabilities[:, numpy.newaxis]) * rng.standard_normal(weights.shape, dtype = GENOME_DTYPE)
+
+    return brains_from_genomes(genomes)
+
+# A (len(brains), GENOME_LENGTH) copy of the brains' genomes, such as to checkpoint or ship them somewhere.
+def stack_genomes(brains):
+    return numpy.stack([brain.genome for brain in brains])
+
+# Brains that share the rows of `genomes`, with no copying.
+def brains_from_genomes(genomes):
+    return [Brain(genome) for genome in genomes]
+
+# A whole generation of brains, with each brain's weights stacked along a leading population axis,
+# so the next moves for every game can be computed with one batched matmul per layer
+# instead of one small `Brain.compute_next_move` per game.
+class Population:
+    def __init__(self, brains):
+        self.brains = brains
+
+        # Compute in float64, the same as `Brain.compute_next_move` does, so both choose the same moves.
+        genomes = stack_genomes(brains).astype(numpy.float64)
+        arrays = dict(
+            (name, genomes[:, begin:end].reshape((len(brains),) + shape))
+                for name, shape, begin, end in _GENOME_LAYOUT
         )
-        figure_canvas = matplotlib.backends.backend_agg.FigureCanvas(figure)
-        figure_canvas.draw()
-        matplotlib.pyplot.close(figure)
-
-        surface = pygame.image.frombuffer(
-            figure_canvas.get_renderer().buffer_rgba(),
-            (int(figure_canvas.get_renderer().width), int(figure_canvas.get_renderer().height)),
-            "RGBA"
+
+        self._input_layer_edge_weights = arrays["_input_layer_edge_weights"]
+        self._input_biases = arrays["_input_biases"]
+
+        # `Brain` computes each hidden neuron as `dot(values, weights[neuron_index, :, hidden_layer_index])`,
+        # which is the transpose of the other layers. Stack them as (layer, brain, neuron, value) so each
+        # layer is one contiguous batch of matrices to multiply against a column of values.
+        self._hidden_layer_edge_weights = numpy.ascontiguousarray(arrays["_hidden_layer_edge_weights"].transpose(3, 0, 1, 2))
+        self._hidden_biases = numpy.ascontiguousarray(arrays["_hidden_biases"].transpose(2, 0, 1))
+
+        self._output_layer_edge_weights = arrays["_output_layer_edge_weights"]
+        self._output_biases = arrays["_output_biases"]
+
+    def __len__(self):
+        return len(self.brains)
+
+    # Takes a (population size, NUM_INPUTS) array, one row of `compute_input_values` per game,
+    # and returns a (population size, NUM_OUTPUTS) boolean array, one row of pressed outputs per brain.
+    def compute_next_moves(self, input_values):
+        layer_neuron_values = numpy.maximum(
+            0,
+            numpy.matmul(input_values[:, numpy.newaxis, :], self._input_layer_edge_weights)[:, 0, :] + self._input_biases
+        )
+
+        for hidden_layer_index in range(NUM_HIDDEN_LAYERS):
+            layer_neuron_values = numpy.maximum(
+                0,
+                numpy.matmul(self._hidden_layer_edge_weights[hidden_layer_index], layer_neuron_values[:, :, numpy.newaxis])[:, :, 0]
+                    + self._hidden_biases[hidden_layer_index]
+            )
+
+        output_values = (
+            numpy.matmul(layer_neuron_values[:, numpy.newaxis, :], self._output_layer_edge_weights)[:, 0, :]
+            + self._output_biases
         )
 
-        return surface
+        return output_values > 0
@@ -0,0 +1,293 @@
+import game as gamex
+import numpy
+
+# Unit x, y steps for each `Direction`, indexed by its enum value.
+DIRECTION_STEPS = numpy.array([(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)])
+
+def direction_deltas(speed_px_per_tick):
+    # `pygame.Rect.move` truncates fractional pixels toward zero, so truncate diagonal moves the same way.
+    diagonal_px_per_tick = int((speed_px_per_tick ** 2 / 2) ** 0.5)
+    is_diagonal = numpy.all(DIRECTION_STEPS != 0, axis = 1)
+
+    return DIRECTION_STEPS * numpy.where(is_diagonal, diagonal_px_per_tick, speed_px_per_tick)[:, numpy.newaxis]
+
+BULLET_DELTAS = direction_deltas(gamex.Bullet.speed_px_per_tick)
+BUFFALO_DELTAS = direction_deltas(gamex.Buffalo.speed_px_per_tick)
+HUNTER_DELTAS = direction_deltas(gamex.Hunter.speed_px_per_tick)
+
+# Where a new bullet appears relative to the hunter's top left, for each `Direction`. Same as `Game.tick`.
+BULLET_OFFSETS = numpy.array([
+    (36, 0),
+    (gamex.Hunter.width, -5),
+    (gamex.Hunter.width, 17),
+    (gamex.Hunter.width, 29),
+    (18, gamex.Hunter.height),
+    (0, 27),
+    (0, 17),
+    (0, -5),
+])
+
+# X, Y, W, H rows.
+INVISIBLE_WALLS = numpy.array([(wall.x, wall.y, wall.width, wall.height) for wall in gamex.INVISIBLE_WALLS])
+
+# Half-open [low, high) ranges, the same as the `range`s in `BUFFALO_SPAWN_AREAS`.
+SPAWN_AREAS_X_LOW = numpy.array([spawn_area["x"].start for spawn_area in gamex.BUFFALO_SPAWN_AREAS])
+SPAWN_AREAS_X_HIGH = numpy.array([spawn_area["x"].stop for spawn_area in gamex.BUFFALO_SPAWN_AREAS])
+SPAWN_AREAS_Y_LOW = numpy.array([spawn_area["y"].start for spawn_area in gamex.BUFFALO_SPAWN_AREAS])
+SPAWN_AREAS_Y_HIGH = numpy.array([spawn_area["y"].stop for spawn_area in gamex.BUFFALO_SPAWN_AREAS])
+SPAWN_AREAS_DIRECTION = numpy.array([spawn_area["direction"] for spawn_area in gamex.BUFFALO_SPAWN_AREAS])
+
+OBSTACLE_SIZE = 80
+
+# Same as `pygame.Rect.colliderect`, but broadcast over arrays of rects.
+def collide(ax, ay, aw, ah, bx, by, bw, bh):
+    return (ax < bx + bw) & (bx < ax + aw) & (ay < by + bh) & (by < ay + ah)
+
+# Plays N games at once, with each game's state kept as one row of NumPy arrays rather than as Python objects,
+# so one tick of every game is a handful of array operations. Follows the same rules as `Game.tick`, but draws its
+# randomness from a NumPy generator, so a `BatchGame` and a `Game` won't play out identically.
+#
+# Actions are a (N, NUM_OUTPUTS) boolean array, in the same WSAD + ENTER + SPACE order as a brain's outputs.
+class BatchGame:
+    def __init__(self, n, rng = None):
+        self.rng = rng if rng is not None else numpy.random.default_rng()
+        self.n = n
+        self.ticks = 0
+        self.scores = numpy.zeros(n, dtype = numpy.int64)
+
+        self.hunter_x = numpy.zeros(n, dtype = numpy.int64)
+        self.hunter_y = numpy.zeros(n, dtype = numpy.int64)
+        self.hunter_direction = numpy.full(n, gamex.Direction.UP)
+        self.hunter_moving = numpy.zeros(n, dtype = bool)
+
+        # One 80x80 obstacle per game, the same as `Game`. Shaped (N, obstacles per game) so sensors can treat
+        # them like a list.
+        self.obstacles_x = self.rng.integers(gamex.Hunter.width, gamex.MAIN_SURFACE_SIZE[0] - OBSTACLE_SIZE, size = (n, 1))
+        self.obstacles_y = self.rng.integers(gamex.Hunter.height, gamex.MAIN_SURFACE_SIZE[1] - OBSTACLE_SIZE, size = (n, 1))
+
+        # Buffalo are appended into the next free slot of their game's row, so slot order is spawn order,
+        # the same as the `Game.buffalos` list. Dead buffalo keep their slot, and still block movement.
+        self.buffalo_capacity = 16
+        self.buffalo_count = numpy.zeros(n, dtype = numpy.int64)
+        self.buffalo_x = numpy.zeros((n, self.buffalo_capacity), dtype = numpy.int64)
+        self.buffalo_y = numpy.zeros((n, self.buffalo_capacity), dtype = numpy.int64)
+        self.buffalo_direction = numpy.zeros((n, self.buffalo_capacity), dtype = numpy.int64)
+        self.buffalo_alive = numpy.zeros((n, self.buffalo_capacity), dtype = bool)
+
+        # A game fires at most one bullet per tick, and a bullet lasts at most `BULLET_MAX_TICKS`,
+        # so a ring buffer of that many slots, indexed by the tick it was fired, never overflows.
+        self.bullet_x = numpy.zeros((n, gamex.BULLET_MAX_TICKS), dtype = numpy.int64)
+        self.bullet_y = numpy.zeros((n, gamex.BULLET_MAX_TICKS), dtype = numpy.int64)
+        self.bullet_direction = numpy.zeros((n, gamex.BULLET_MAX_TICKS), dtype = numpy.int64)
+        self.bullet_created_on_tick = numpy.zeros((n, gamex.BULLET_MAX_TICKS), dtype = numpy.int64)
+        self.bullet_active = numpy.zeros((n, gamex.BULLET_MAX_TICKS), dtype = bool)
+
+    def buffalo_spawned(self):
+        return numpy.arange(self.buffalo_capacity) < self.buffalo_count[:, numpy.newaxis]
+
+    def _grow_buffalo_capacity(self):
+        self.buffalo_capacity *= 2
+        for attribute_name in ["buffalo_x", "buffalo_y", "buffalo_direction", "buffalo_alive"]:
+            values = getattr(self, attribute_name)
+            grown_values = numpy.zeros((self.n, self.buffalo_capacity), dtype = values.dtype)
+            grown_values[:, :values.shape[1]] = values
+            setattr(self, attribute_name, grown_values)
+
+    def tick(self, actions):
+        self.ticks += 1
+        if self.ticks >= gamex.GAME_MAX_TICKS:
+            return False
+
+        # Move bullets. Inactive slots move too, but they're ignored until they're reused.
+        self.bullet_x += BULLET_DELTAS[self.bullet_direction, 0]
+        self.bullet_y += BULLET_DELTAS[self.bullet_direction, 1]
+
+        self._move_buffalos()
+        self._collide_bullets()
+        self._spawn_buffalos()
+        self._move_hunters(actions)
+        self._fire_bullets(actions)
+
+        return True
+
+    def _move_buffalos(self):
+        # Living buffalo randomly change direction. `Game.tick` draws this just before each buffalo moves,
+        # but a buffalo's direction doesn't affect any other buffalo's move, so draw them all up front.
+        changing_direction = (
+            self.buffalo_alive
+            & (self.rng.integers(gamex.BUFFALO_CHANGE_DIRECTION_AVG_TICKS, size = self.buffalo_alive.shape) == 0)
+        )
+        new_directions = self.rng.integers(8, size = self.buffalo_alive.shape) # One of eight direction enums.
+        self.buffalo_direction = numpy.where(changing_direction, new_directions, self.buffalo_direction)
+
+        # Each buffalo collides with the *already moved* buffalo before it, so move one slot at a time,
+        # in spawn order, but across every game at once.
+        buffalo_spawned = self.buffalo_spawned()
+        for slot in range(int(self.buffalo_count.max(initial = 0))):
+            games = numpy.flatnonzero(self.buffalo_alive[:, slot])
+            if len(games) == 0:
+                continue
+
+            directions = self.buffalo_direction[games, slot]
+            moved_x = self.buffalo_x[games, slot] + BUFFALO_DELTAS[directions, 0]
+            moved_y = self.buffalo_y[games, slot] + BUFFALO_DELTAS[directions, 1]
+
+            colliding = collide(
+                moved_x, moved_y, gamex.Buffalo.width, gamex.Buffalo.height,
+                self.hunter_x[games], self.hunter_y[games], gamex.Hunter.width, gamex.Hunter.height
+            )
+
+            other_buffalos = buffalo_spawned[games]
+            other_buffalos[:, slot] = False
+            colliding |= numpy.any(
+                other_buffalos
+                    & collide(
+                        moved_x[:, numpy.newaxis], moved_y[:, numpy.newaxis], gamex.Buffalo.width, gamex.Buffalo.height,
+                        self.buffalo_x[games], self.buffalo_y[games], gamex.Buffalo.width, gamex.Buffalo.height
+                    ),
+                axis = 1
+            )
+
+            colliding |= numpy.any(
+                collide(
+                    moved_x[:, numpy.newaxis], moved_y[:, numpy.newaxis], gamex.Buffalo.width, gamex.Buffalo.height,
+                    self.obstacles_x[games], self.obstacles_y[games], OBSTACLE_SIZE, OBSTACLE_SIZE
+                ),
+                axis = 1
+            )
+
+            moving_games = games[~colliding]
+            self.buffalo_x[moving_games, slot] = moved_x[~colliding]
+            self.buffalo_y[moving_games, slot] = moved_y[~colliding]
+
+    def _collide_bullets(self):
+        expired = self.bullet_active & (self.ticks - self.bullet_created_on_tick >= gamex.BULLET_MAX_TICKS)
+        self.bullet_active &= ~expired
+
+        games, slots = numpy.nonzero(self.bullet_active)
+        if len(games) == 0:
+            return
+        bullets_x = self.bullet_x[games, slots]
+        bullets_y = self.bullet_y[games, slots]
+
+        # Like `collidelist`, a bullet stops at the *first* buffalo it overlaps, dead or alive.
+        buffalo_collisions = self.buffalo_spawned()[games] & collide(
+            bullets_x[:, numpy.newaxis], bullets_y[:, numpy.newaxis], 1, 1,
+            self.buffalo_x[games], self.buffalo_y[games], gamex.Buffalo.width, gamex.Buffalo.height
+        )
+        hit_buffalo = numpy.any(buffalo_collisions, axis = 1)
+        hit_games = games[hit_buffalo]
+        hit_slots = numpy.argmax(buffalo_collisions[hit_buffalo], axis = 1)
+
+        # Several bullets can hit the same buffalo on the same tick, but it only dies, and scores, once.
+        killing = self.buffalo_alive[hit_games, hit_slots]
+        killed_buffalos = numpy.unique(hit_games[killing] * self.buffalo_capacity + hit_slots[killing])
+        killed_games, killed_slots = numpy.divmod(killed_buffalos, self.buffalo_capacity)
+        self.buffalo_alive[killed_games, killed_slots] = False
+        numpy.add.at(self.scores, killed_games, 1000)
+
+        hit_obstacle = numpy.any(
+            collide(
+                bullets_x[:, numpy.newaxis], bullets_y[:, numpy.newaxis], 1, 1,
+                self.obstacles_x[games], self.obstacles_y[games], OBSTACLE_SIZE, OBSTACLE_SIZE
+            ),
+            axis = 1
+        )
+
+        removing = hit_buffalo | hit_obstacle
+        self.bullet_active[games[removing], slots[removing]] = False
+
+    def _spawn_buffalos(self):
+        games = numpy.flatnonzero(self.rng.integers(gamex.BUFFALO_SPAWN_AVG_TICKS, size = self.n) == 0)
+        if len(games) == 0:
+            return
+
+        spawn_areas = self.rng.integers(len(gamex.BUFFALO_SPAWN_AREAS), size = len(games))
+        spawn_x = self.rng.integers(SPAWN_AREAS_X_LOW[spawn_areas], SPAWN_AREAS_X_HIGH[spawn_areas])
+        spawn_y = self.rng.integers(SPAWN_AREAS_Y_LOW[spawn_areas], SPAWN_AREAS_Y_HIGH[spawn_areas])
+
+        if self.buffalo_count[games].max() >= self.buffalo_capacity:
+            self._grow_buffalo_capacity()
+
+        slots = self.buffalo_count[games]
+        self.buffalo_x[games, slots] = spawn_x
+        self.buffalo_y[games, slots] = spawn_y
+        self.buffalo_direction[games, slots] = SPAWN_AREAS_DIRECTION[spawn_areas]
+        self.buffalo_alive[games, slots] = True
+        self.buffalo_count[games] += 1
+
+    def _move_hunters(self, actions):
+        w, s, a, d, enter = actions[:, 0], actions[:, 1], actions[:, 2], actions[:, 3], actions[:, 4]
+
+        # Same precedence as the if/elif chain in `Game.tick`.
+        self.hunter_direction = numpy.select(
+            [w & d, s & d, s & a, w & a, w, d, s, a],
+            [
+                gamex.Direction.UP_RIGHT,
+                gamex.Direction.DOWN_RIGHT,
+                gamex.Direction.DOWN_LEFT,
+                gamex.Direction.UP_LEFT,
+                gamex.Direction.UP,
+                gamex.Direction.RIGHT,
+                gamex.Direction.DOWN,
+                gamex.Direction.LEFT,
+            ],
+            self.hunter_direction
+        )
+
+        # Start/stop moving.
+        self.hunter_moving ^= enter
+
+        games = numpy.flatnonzero(self.hunter_moving)
+        if len(games) == 0:
+            return
+
+        directions = self.hunter_direction[games]
+        moved_x = self.hunter_x[games] + HUNTER_DELTAS[directions, 0]
+        moved_y = self.hunter_y[games] + HUNTER_DELTAS[directions, 1]
+
+        colliding = numpy.any(
+            self.buffalo_spawned()[games]
+                & collide(
+                    moved_x[:, numpy.newaxis], moved_y[:, numpy.newaxis], gamex.Hunter.width, gamex.Hunter.height,
+                    self.buffalo_x[games], self.buffalo_y[games], gamex.Buffalo.width, gamex.Buffalo.height
+                ),
+            axis = 1
+        )
+        colliding |= numpy.any(
+            collide(
+                moved_x[:, numpy.newaxis], moved_y[:, numpy.newaxis], gamex.Hunter.width, gamex.Hunter.height,
+                INVISIBLE_WALLS[:, 0], INVISIBLE_WALLS[:, 1], INVISIBLE_WALLS[:, 2], INVISIBLE_WALLS[:, 3]
+            ),
+            axis = 1
+        )
+        colliding |= numpy.any(
+            collide(
+                moved_x[:, numpy.newaxis], moved_y[:, numpy.newaxis], gamex.Hunter.width, gamex.Hunter.height,
+                self.obstacles_x[games], self.obstacles_y[games], OBSTACLE_SIZE, OBSTACLE_SIZE
+            ),
+            axis = 1
+        )
+
+        moving_games = games[~colliding]
+        self.hunter_x[moving_games] = moved_x[~colliding]
+        self.hunter_y[moving_games] = moved_y[~colliding]
+
+        # Small reward to encourage use.
+        self.scores[moving_games] += 1
+
+    def _fire_bullets(self, actions):
+        games = numpy.flatnonzero(actions[:, 5])
+        if len(games) == 0:
+            return
+
+        directions = self.hunter_direction[games]
+        slot = self.ticks % gamex.BULLET_MAX_TICKS
+        self.bullet_x[games, slot] = self.hunter_x[games] + BULLET_OFFSETS[directions, 0]
+        self.bullet_y[games, slot] = self.hunter_y[games] + BULLET_OFFSETS[directions, 1]
+        self.bullet_direction[games, slot] = directions
+        self.bullet_created_on_tick[games, slot] = self.ticks
+        self.bullet_active[games, slot] = True
+
+        # Small reward to encourage use.
+        self.scores[games] += 1
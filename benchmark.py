@@ -0,0 +1,276 @@
+import ai
+import game as gamex
+import training
+
+import json
+import math
+import numpy
+import os
+import platform
+import pygame
+import subprocess
+import sys
+import tempfile
+import timeit
+
+# Every benchmark starts from these seeds, so each run measures the same work.
+SEED = 1234
+BRAIN_SEED = 5678
+
+# Each benchmark runs this many times and reports its fastest, which is the least disturbed by whatever
+# else the machine is doing.
+REPEATS = 5
+
+# Runs slower than the baseline by more than this fraction count as regressions.
+DEFAULT_TOLERANCE = 0.1
+
+# Holds `n` buffalo, placed across the main area with the game's own seeded generator, and ready to tick.
+def game_with_buffalos(n, seed = SEED):
+    game = gamex.Game(seed)
+    for _ in range(n):
+        game.spawn_buffalo(gamex.Buffalo(
+            (
+                game.rng.randrange(gamex.MAIN_SURFACE_SIZE[0] - gamex.Buffalo.width),
+                game.rng.randrange(gamex.MAIN_SURFACE_SIZE[1] - gamex.Buffalo.height)
+            ),
+            game.rng.randrange(8) # One of eight direction enums.
+        ))
+
+    return game
+
+# Brains a few generations of mutation away from blank, so their outputs aren't all zero.
+def mutated_brains(n, seed = BRAIN_SEED):
+    rng = numpy.random.default_rng(seed)
+    brains = ai.mutate_population([ai.Brain()], n, rng)
+    for _ in range(3):
+        brains = ai.mutate_population(brains, n, rng)
+
+    return brains
+
+# The same few actions, over and over, so the hunter moves, turns, and shoots.
+def actions_cycle():
+    return [
+        gamex.ACTION_TOGGLE_MOVING,
+        gamex.ACTION_RIGHT | gamex.ACTION_FIRE,
+        0,
+        gamex.ACTION_UP,
+        gamex.ACTION_FIRE,
+        gamex.ACTION_LEFT,
+    ]
+
+# Seconds per call of `function`, the fastest of `REPEATS` runs of `number` calls each. `setup`, if given,
+# runs before each run, untimed, and its return value is passed to every call.
+def seconds_per_call(function, number, setup = None):
+    best_seconds = math.inf
+    for _ in range(REPEATS):
+        state = setup() if setup else None
+        seconds = timeit.timeit(lambda: function(state), number = number)
+        best_seconds = min(best_seconds, seconds / number)
+
+    return best_seconds
+
+def bench_game_tick(buffalo_counts):
+    actions_each_tick = actions_cycle()
+    results = {}
+    for buffalo_count in buffalo_counts:
+        num_ticks = 100
+
+        def tick_game(game):
+            for tick in range(num_ticks):
+                game.tick(actions_each_tick[tick % len(actions_each_tick)])
+
+        seconds = seconds_per_call(tick_game, 1, lambda: game_with_buffalos(buffalo_count)) / num_ticks
+        results[f"game_tick_{buffalo_count}_buffalos"] = {"value": 1 / seconds, "unit": "ticks/s", "higher_is_better": True}
+
+    return results
+
+def bench_compute_next_move():
+    brain = mutated_brains(1)[0]
+    game = game_with_buffalos(10)
+    brains = mutated_brains(training.POPULATION_SIZE)
+    population = ai.Population(brains)
+    games = [game_with_buffalos(10, SEED + index) for index in range(len(brains))]
+
+    return {
+        "brain_compute_next_move": {
+            "value": seconds_per_call(lambda state: brain.compute_next_move(game), 1000) * 1e6,
+            "unit": "us",
+            "higher_is_better": False
+        },
+        f"population_compute_next_moves_{len(brains)}": {
+            "value": seconds_per_call(lambda state: population.compute_next_moves(ai.compute_games_input_values(games)), 100) * 1e3,
+            "unit": "ms",
+            "higher_is_better": False
+        },
+    }
+
+def bench_mutate():
+    brain = mutated_brains(1)[0]
+    brains = mutated_brains(training.POPULATION_SIZE)
+
+    return {
+        "brain_mutate": {
+            "value": seconds_per_call(lambda rng: brain.mutate(rng), 1000, lambda: numpy.random.default_rng(SEED)) * 1e6,
+            "unit": "us",
+            "higher_is_better": False
+        },
+        f"mutate_population_{len(brains)}": {
+            "value": seconds_per_call(
+                lambda rng: ai.mutate_population(brains[:len(brains) // 2], len(brains), rng), 20, lambda: numpy.random.default_rng(SEED)
+            ) * 1e3,
+            "unit": "ms",
+            "higher_is_better": False
+        },
+    }
+
+def bench_render():
+    pygame.font.init()
+
+    game = game_with_buffalos(10)
+    games = [game_with_buffalos(10, SEED + index) for index in range(training.POPULATION_SIZE)]
+    screen = pygame.Surface(gamex.SCREEN_SIZE)
+    num_games_sqrt = math.ceil(len(games) ** 0.5)
+    tile_width, tile_height = (screen.get_width() // num_games_sqrt, screen.get_height() // num_games_sqrt)
+    tile_surfaces = [
+        screen.subsurface(pygame.Rect(index % num_games_sqrt * tile_width, index // num_games_sqrt * tile_height, tile_width, tile_height))
+            for index in range(len(games))
+    ]
+
+    def render_gallery(state):
+        for game, tile_surface in zip(games, tile_surfaces):
+            game.render(tile_surface, 1 / num_games_sqrt)
+
+    return {
+        "game_render": {"value": seconds_per_call(lambda state: game.render(), 200) * 1e3, "unit": "ms", "higher_is_better": False},
+        f"gallery_render_{len(games)}": {"value": seconds_per_call(render_gallery, 5) * 1e3, "unit": "ms", "higher_is_better": False},
+    }
+
+# Importing the simulation and inference core, in a fresh interpreter, as a training worker does. Runs from outside
+# the repo, so importing fails outright if the core goes back to loading assets at import. Importing must also leave
+# pygame's display and fonts uninitialized, and the sprite sheets unloaded, since workers never draw.
+STARTUP_SCRIPT = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+started = time.perf_counter()
+import ai, batch_game, game, parallel, training
+seconds = time.perf_counter() - started
+
+import pygame
+if pygame.display.get_init():
+    sys.exit("importing the core initialized pygame's display")
+if pygame.font.get_init():
+    sys.exit("importing the core initialized pygame's fonts")
+if game._sprite_sheets is not None:
+    sys.exit("importing the core loaded the sprite sheets")
+print(seconds)
+"""
+
+# Importing the core takes about 200ms on a laptop, most of it NumPy's. Well past that, something heavy crept into
+# import, so `bench_startup` fails rather than report it.
+STARTUP_MAX_MS = 500
+
+def bench_startup():
+    best_seconds = math.inf
+    for _ in range(REPEATS):
+        completed = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT, os.path.dirname(os.path.abspath(__file__))],
+            cwd = tempfile.gettempdir(),
+            env = {**os.environ, "PYGAME_HIDE_SUPPORT_PROMPT": "1"},
+            capture_output = True,
+            text = True
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"importing the core failed: {completed.stderr.strip()}")
+        best_seconds = min(best_seconds, float(completed.stdout))
+
+    if best_seconds * 1e3 > STARTUP_MAX_MS:
+        raise RuntimeError(f"importing the core took {best_seconds * 1e3:.0f}ms, more than {STARTUP_MAX_MS}ms")
+
+    return {"startup_import_core": {"value": best_seconds * 1e3, "unit": "ms", "higher_is_better": False}}
+
+# One whole generation, playing every game and breeding the next generation, for each engine and population size.
+def bench_generation(engines_population_sizes):
+    results = {}
+    for engine, population_size in engines_population_sizes:
+        brains = mutated_brains(population_size)
+        play_episodes = training.ENGINES[engine]
+
+        def play_generation(rng):
+            scores = play_episodes(brains, seeds = training.episode_seeds(rng, len(brains)))
+            training.next_generation(brains, scores, rng)
+
+        # Whole generations are slow, so time fewer of them.
+        best_seconds = math.inf
+        for _ in range(2):
+            rng = numpy.random.default_rng(SEED)
+            best_seconds = min(best_seconds, timeit.timeit(lambda: play_generation(rng), number = 1))
+        results[f"generation_{engine}_{population_size}"] = {"value": best_seconds, "unit": "s", "higher_is_better": False}
+
+    return results
+
+def run(quick = False):
+    results = {}
+    results.update(bench_startup())
+    results.update(bench_game_tick([0, 10, 100] if quick else [0, 10, 100, 400]))
+    results.update(bench_compute_next_move())
+    results.update(bench_mutate())
+    results.update(bench_render())
+    results.update(bench_generation(
+        [("batch", 144), ("game", 144)] if quick
+            else [("batch", 144), ("batch", 1000), ("batch", 10000), ("game", 144), ("game", 1000)]
+    ))
+
+    return {
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+# Returns (metric name, baseline value, value, fractional change, regressed) rows, for the metrics both reports have.
+# The fractional change is positive when the new value is better.
+def compare(report, baseline_report, tolerance = DEFAULT_TOLERANCE):
+    comparisons = []
+    for name, result in report["results"].items():
+        if name not in baseline_report["results"]:
+            continue
+
+        baseline_value = baseline_report["results"][name]["value"]
+        value = result["value"]
+        if result["higher_is_better"]:
+            change = value / baseline_value - 1
+        else:
+            change = baseline_value / value - 1
+        comparisons.append((name, baseline_value, value, change, change < - tolerance))
+
+    return comparisons
+
+def print_comparisons(comparisons, report, stream = sys.stdout):
+    for name, baseline_value, value, change, regressed in comparisons:
+        unit = report["results"][name]["unit"]
+        print(
+            f"{name:40} {baseline_value:12.3f} -> {value:12.3f} {unit:8} {change:+8.1%}{"  REGRESSED" if regressed else ""}",
+            file = stream
+        )
+
+# Runs the benchmarks, optionally saves the report, and compares against a baseline report if given.
+# Returns False if anything regressed.
+def main(output_path = None, baseline_path = None, tolerance = DEFAULT_TOLERANCE, quick = False):
+    report = run(quick)
+
+    if output_path:
+        with open(output_path, "w") as output_file:
+            json.dump(report, output_file, indent = 2)
+    else:
+        json.dump(report, sys.stdout, indent = 2)
+        print()
+
+    if not baseline_path:
+        return True
+
+    with open(baseline_path) as baseline_file:
+        comparisons = compare(report, json.load(baseline_file), tolerance)
+    print_comparisons(comparisons, report, sys.stderr)
+
+    return not any(regressed for name, baseline_value, value, change, regressed in comparisons)
@@ -0,0 +1,138 @@
+import ai
+
+import concurrent.futures
+import numpy
+import pygame
+
+# Draws a brain's graph straight into a pygame surface, in a few milliseconds, so it can be redrawn every frame.
+# The topology is fixed, so node positions and edge endpoints are laid out once per surface size, and each draw
+# only maps the brain's weights to colors.
+
+# Matplotlib's "Blues" colormap, from lightest to darkest, which edges were colored by before.
+_BLUES_COLORS = numpy.array([
+    (247, 251, 255), (222, 235, 247), (198, 219, 239), (158, 202, 225), (107, 174, 214),
+    (66, 146, 198), (33, 113, 181), (8, 81, 156), (8, 48, 107),
+])
+
+# The same colormap, interpolated to 256 colors, so mapping weights to colors is one lookup.
+_BLUES_LOOKUP = numpy.stack(
+    [
+        numpy.interp(numpy.linspace(0, 1, 256), numpy.linspace(0, 1, len(_BLUES_COLORS)), _BLUES_COLORS[:, channel])
+            for channel in range(3)
+    ],
+    axis = 1
+).round().astype(numpy.int64)
+
+# Each column's node heights, in units of inputs, bottom to top: the inputs, each layer's neurons, then the outputs.
+def _columns_node_ys():
+    neuron_ys = numpy.arange(ai.NUM_NEURONS_PER_LAYER) / ai.NUM_NEURONS_PER_LAYER * ai.NUM_INPUTS
+
+    return (
+        [numpy.arange(ai.NUM_INPUTS, dtype = numpy.float64)]
+        + [neuron_ys] * (1 + ai.NUM_HIDDEN_LAYERS)
+        + [numpy.arange(ai.NUM_OUTPUTS) / ai.NUM_OUTPUTS * ai.NUM_INPUTS]
+    )
+
+_layouts = {}
+
+def _layout(size):
+    if size in _layouts:
+        return _layouts[size]
+
+    width, height = size
+    columns_node_ys = _columns_node_ys()
+    node_radius = max(1, min(width, height) // 50)
+    margin_x = width * 0.08
+    margin_y = node_radius + height * 0.06
+
+    columns_nodes_xy = []
+    for column, node_ys in enumerate(columns_node_ys):
+        nodes_x = numpy.full(len(node_ys), margin_x + column * (width - margin_x * 2) / (len(columns_node_ys) - 1))
+        nodes_y = height - margin_y - node_ys / (ai.NUM_INPUTS - 1) * (height - margin_y * 2)
+        columns_nodes_xy.append(numpy.stack([nodes_x, nodes_y], axis = 1))
+
+    # Every edge from each column to the next, in the same order as `Brain.edge_weights`.
+    edges_begin = numpy.concatenate([
+        numpy.repeat(lhs_nodes_xy, len(rhs_nodes_xy), axis = 0)
+            for lhs_nodes_xy, rhs_nodes_xy in zip(columns_nodes_xy, columns_nodes_xy[1:])
+    ])
+    edges_end = numpy.concatenate([
+        numpy.tile(rhs_nodes_xy, (len(lhs_nodes_xy), 1))
+            for lhs_nodes_xy, rhs_nodes_xy in zip(columns_nodes_xy, columns_nodes_xy[1:])
+    ])
+
+    # The nodes never change, so draw them once, translucent, to blit over the edges.
+    nodes_surface = pygame.Surface(size, pygame.SRCALPHA)
+    for node_xy in numpy.concatenate(columns_nodes_xy).tolist():
+        pygame.draw.circle(nodes_surface, (0, 0, 255, 90), node_xy, node_radius)
+
+    layout = {
+        "edges_begin": edges_begin,
+        "edges_end": edges_end,
+        "nodes_surface": nodes_surface,
+    }
+    _layouts[size] = layout
+
+    return layout
+
+# Fills `target` with `brain`'s graph. Edges are colored from light to dark by weight, stretched over the lowest
+# to the highest weight. Edges weighing exactly 0 aren't drawn.
+def draw(brain, target):
+    layout = _layout(target.get_size())
+    target.fill("white")
+
+    weights = brain.edge_weights()
+    edges = numpy.flatnonzero(weights != 0)
+    if len(edges):
+        # Lightest first, so the heaviest edges end up on top.
+        edges = edges[numpy.argsort(weights[edges], kind = "stable")]
+        edges_weights = weights[edges]
+        weights_range = edges_weights[-1] - edges_weights[0]
+        colors_indices = (
+            ((edges_weights - edges_weights[0]) / weights_range * 255).astype(numpy.int64) if weights_range > 0
+                else numpy.full(len(edges), 255)
+        )
+
+        for begin, end, color in zip(
+            layout["edges_begin"][edges].tolist(), layout["edges_end"][edges].tolist(), _BLUES_LOOKUP[colors_indices].tolist()
+        ):
+            pygame.draw.line(target, color, begin, end)
+
+    target.blit(layout["nodes_surface"], (0, 0))
+
+# Draws brain graphs on a background thread, so the training view never waits on one. A draw only takes a few
+# milliseconds, and a brain's weights never change, so each graph is drawn once, when the brain or size shown changes,
+# rather than every frame. Until it's ready, callers get the last graph drawn at that size, if any.
+class BrainGraphRenderer:
+    def __init__(self):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+        self._requested = None
+        self._pending_graph = None
+        # The newest graph drawn, by size.
+        self._graphs = {}
+
+    # Returns the newest graph drawn at `size`, or None before the first one is ready.
+    # Starts drawing `brain`'s graph at that size, if it isn't already.
+    def graph(self, brain, size):
+        if self._requested != (brain, size):
+            # Only the newest request matters, so skip the last one if it hasn't started yet.
+            if self._pending_graph:
+                self._pending_graph.cancel()
+
+            self._requested = (brain, size)
+            self._pending_graph = self._executor.submit(_drawn_surface, brain, size)
+
+        if self._pending_graph and self._pending_graph.done():
+            self._graphs[size] = self._pending_graph.result()
+            self._pending_graph = None
+
+        return self._graphs.get(size)
+
+    def close(self):
+        self._executor.shutdown(wait = False, cancel_futures = True)
+
+def _drawn_surface(brain, size):
+    surface = pygame.Surface(size)
+    draw(brain, surface)
+
+    return surface
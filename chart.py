@@ -0,0 +1,108 @@
+import math
+import pygame
+
+# A line chart that's cheap to keep up to date. Values are appended one at a time, such as one per generation, and
+# folded into at most one bucket per pixel column. Each bucket keeps its first, lowest, highest, and last value, so
+# spikes survive decimation. Once every column has a bucket, neighboring buckets merge in pairs, so however many
+# values there are, drawing the chart only walks one plot width's worth of buckets. And it's only redrawn when a
+# value is appended. The rest of the time, it's one blit.
+class LineChart:
+    MARGIN_LEFT = 110
+    MARGIN_RIGHT = 30
+    MARGIN_TOP = 20
+    MARGIN_BOTTOM = 60
+    NUM_Y_TICKS = 5
+    LINE_COLOR = (31, 119, 180)
+
+    def __init__(self, size, font, y_label, x_label):
+        self.size = size
+        self.font = font
+        self.y_label = y_label
+        self.x_label = x_label
+        self.num_values = 0
+
+        self._plot_rect = pygame.Rect(
+            LineChart.MARGIN_LEFT,
+            LineChart.MARGIN_TOP,
+            size[0] - LineChart.MARGIN_LEFT - LineChart.MARGIN_RIGHT,
+            size[1] - LineChart.MARGIN_TOP - LineChart.MARGIN_BOTTOM
+        )
+
+        # Each bucket is [first, lowest, highest, last] of `_bucket_size` consecutive values. The last bucket can be partly full.
+        self._buckets = []
+        self._bucket_size = 1
+        self._low = math.inf
+        self._high = - math.inf
+
+        self._surface = None
+
+    def append(self, value):
+        if self.num_values % self._bucket_size == 0 and len(self._buckets) == self._plot_rect.width:
+            self._buckets = [
+                self._merge_buckets(self._buckets[index:index + 2]) for index in range(0, len(self._buckets), 2)
+            ]
+            self._bucket_size *= 2
+
+        if self.num_values % self._bucket_size == 0:
+            self._buckets.append([value, value, value, value])
+        else:
+            bucket = self._buckets[-1]
+            bucket[1] = min(bucket[1], value)
+            bucket[2] = max(bucket[2], value)
+            bucket[3] = value
+
+        self.num_values += 1
+        self._low = min(self._low, value)
+        self._high = max(self._high, value)
+        self._surface = None
+
+    def _merge_buckets(self, buckets):
+        return [buckets[0][0], min(bucket[1] for bucket in buckets), max(bucket[2] for bucket in buckets), buckets[-1][3]]
+
+    def render(self, target, xy = (0, 0)):
+        if not self._surface:
+            self._surface = self._draw()
+
+        target.blit(self._surface, xy)
+
+    def _draw(self):
+        surface = pygame.Surface(self.size)
+        surface.fill("white")
+        plot_rect = self._plot_rect
+
+        # A flat line, or no line at all, still needs a range to span.
+        low, high = (self._low, self._high) if self.num_values else (0, 1)
+        if high == low:
+            low, high = low - 1, high + 1
+
+        def plot_y(value):
+            return plot_rect.bottom - 1 - (value - low) / (high - low) * (plot_rect.height - 1)
+
+        # Each bucket is a vertical stroke from its lowest to its highest value, joined to its neighbors by its first and last values.
+        points = []
+        for bucket_index, bucket in enumerate(self._buckets):
+            x = plot_rect.left + bucket_index * (plot_rect.width - 1) / max(len(self._buckets) - 1, 1)
+            points.extend((x, plot_y(value)) for value in bucket)
+        if len(self._buckets) >= 2:
+            pygame.draw.lines(surface, LineChart.LINE_COLOR, False, points, 2)
+        elif points:
+            pygame.draw.circle(surface, LineChart.LINE_COLOR, points[0], 3)
+
+        pygame.draw.rect(surface, "black", plot_rect.inflate(2, 2), 1)
+
+        for tick_index in range(LineChart.NUM_Y_TICKS):
+            value = low + (high - low) * tick_index / (LineChart.NUM_Y_TICKS - 1)
+            text = self.font.render(f"{value:.6g}", True, "black")
+            surface.blit(text, text.get_rect(midright = (plot_rect.left - 8, plot_y(value))))
+
+        for x_tick, text_x in [(1, plot_rect.left), (max(self.num_values, 1), plot_rect.right)]:
+            text = self.font.render(str(x_tick), True, "black")
+            surface.blit(text, text.get_rect(midtop = (text_x, plot_rect.bottom + 6)))
+
+        text = self.font.render(self.x_label, True, "black")
+        surface.blit(text, text.get_rect(midbottom = (plot_rect.centerx, self.size[1] - 6)))
+
+        text = pygame.transform.rotate(self.font.render(self.y_label, True, "black"), 90)
+        surface.blit(text, text.get_rect(midleft = (6, plot_rect.centery)))
+
+        return surface
@@ -0,0 +1,75 @@
+import ai
+
+import concurrent.futures
+import json
+import numpy
+import os
+import tempfile
+
+# A checkpoint is one uncompressed .npz file with the whole population's genomes as a single
+# (population size, GENOME_LENGTH) float32 array, each past generation's stats, and the mutation RNG's state.
+# Nothing in it is pickled, so loading is a couple of array reads.
+
+# Writes to a temporary file next to `path`, then renames it over `path`. The rename is atomic, so a crash
+# mid-write leaves the previous checkpoint intact, never a half written one.
+def write(path, genomes, generation_avg_stats, rng_state):
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temp_path = tempfile.mkstemp(dir = directory, prefix = ".checkpoint-", suffix = ".npz")
+    try:
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            numpy.savez(
+                temp_file,
+                genomes = genomes,
+                scores = numpy.array([stat["score"] for stat in generation_avg_stats], dtype = numpy.float64),
+                mutation_rates = numpy.array([stat["mutation_rate"] for stat in generation_avg_stats], dtype = numpy.float64),
+                rng_state = numpy.array(json.dumps(rng_state)),
+            )
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+# Returns (brains, generation_avg_stats), and restores the mutation RNG's state into `rng`.
+def load(path, rng = None):
+    with numpy.load(path, allow_pickle = False) as checkpoint:
+        brains = ai.brains_from_genomes(checkpoint["genomes"].astype(ai.GENOME_DTYPE, copy = False))
+        generation_avg_stats = [
+            {"score": float(score), "mutation_rate": float(mutation_rate)}
+                for score, mutation_rate in zip(checkpoint["scores"], checkpoint["mutation_rates"])
+        ]
+        (rng if rng is not None else ai._default_rng).bit_generator.state = json.loads(str(checkpoint["rng_state"]))
+
+    return brains, generation_avg_stats
+
+# Saves checkpoints on a background thread, so training doesn't wait on the disk. Only the copy of the genomes
+# happens on the caller's thread. Writes happen in the order they're submitted.
+class Checkpointer:
+    def __init__(self, path, every_generations = 1, rng = None):
+        self.path = path
+        self.every_generations = every_generations
+        self.rng = rng if rng is not None else ai._default_rng
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+        self._last_write = None
+
+    # Call once per generation, after appending that generation's stats. Checkpoints every `every_generations`.
+    def generation_finished(self, brains, generation_avg_stats):
+        if len(generation_avg_stats) % self.every_generations != 0:
+            return
+
+        # Surface a failed write, such as a full disk, rather than silently training without checkpoints.
+        if self._last_write and self._last_write.done():
+            self._last_write.result()
+
+        self._last_write = self._executor.submit(
+            write,
+            self.path,
+            ai.stack_genomes(brains),
+            list(generation_avg_stats),
+            self.rng.bit_generator.state
+        )
+
+    # Waits for pending writes to finish.
+    def close(self):
+        self._executor.shutdown(wait = True)
+        if self._last_write:
+            self._last_write.result()
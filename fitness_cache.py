@@ -0,0 +1,46 @@
+import collections
+import hashlib
+
+# Scores of games already played, by (genome hash, game seed), so a brain that plays a game some brain with the
+# same weights already played doesn't have to play it again. With a low probability of mutation, many children are
+# bit-identical copies of their parent. Games are deterministic given the seed and the brain, but only `Game`
+# games: a `BatchGame`'s games share one generator, so their scores depend on the rest of the batch.
+# Bounded, and evicts the least recently used scores first.
+class FitnessCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._scores = collections.OrderedDict()
+
+        # Lookups, since the cache was made.
+        self.hits = 0
+        self.misses = 0
+
+    # Hashes only the weights. The probability of mutation is part of the genome too, but has no effect on play.
+    @staticmethod
+    def genome_hash(brain):
+        return hashlib.blake2b(brain.genome[1:].tobytes(), digest_size = 16).digest()
+
+    # The cached score, or None.
+    def get(self, genome_hash, seed):
+        key = (genome_hash, seed)
+        if key not in self._scores:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._scores.move_to_end(key)
+
+        return self._scores[key]
+
+    def put(self, genome_hash, seed, score):
+        key = (genome_hash, seed)
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        if len(self._scores) > self.max_entries:
+            self._scores.popitem(last = False)
+
+    def hit_rate(self):
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses else 0
+
+    def __len__(self):
+        return len(self._scores)
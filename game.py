@@ -1,3 +1,4 @@
+import numpy
 import pygame
 import random
 
@@ -51,9 +52,30 @@ def prompt_main_menu(screen):
                     if keys_pressed[pygame.K_t]:
                         return pygame.K_t
 
-hunter_sprite = pygame.image.load("assets/hunter_sprite.png")
-buffalo_img = pygame.image.load("assets/buffalo.png")
-obstacles_deer_sprite = pygame.image.load("assets/obstacles_deer_sprite.png")
+# The sprite sheets, loaded on the first render rather than at import, so simulating games, such as in training
+# workers, never touches the assets or pygame's image support. Ticking needs sprite sizes, not sprites.
+_sprite_sheets = None
+
+def _load_sprite_sheets():
+    global _sprite_sheets
+    if _sprite_sheets:
+        return _sprite_sheets
+
+    buffalo_img = pygame.image.load("assets/buffalo.png")
+    _sprite_sheets = {
+        "hunter": pygame.image.load("assets/hunter_sprite.png"),
+        # Every orientation of the buffalo, by (facing right, alive). The sprite faces left, and dead buffalo are
+        # upside down. Flipping the sprite per buffalo per frame was expensive in the profiler, so flip it once here.
+        "buffalos": {
+            (False, True): buffalo_img,
+            (True, True): pygame.transform.flip(buffalo_img, True, False),
+            (False, False): pygame.transform.flip(buffalo_img, False, True),
+            (True, False): pygame.transform.flip(buffalo_img, True, True),
+        },
+        "obstacles_deer": pygame.image.load("assets/obstacles_deer_sprite.png"),
+    }
+
+    return _sprite_sheets
 
 # WARNING! The order of these enum values "just happen" to match the order of the hunter sprite.
 class Direction:
@@ -85,8 +107,9 @@ class Bullet:
         self.rect = pygame.Rect(xy, (1, 1))
 
 class Buffalo:
-    height = buffalo_img.get_rect().height
-    width = buffalo_img.get_rect().width
+    # The size of assets/buffalo.png.
+    height = 34
+    width = 56
     speed_px_per_tick = 5
 
     def __init__(self, xy = (0, 0), direction = Direction.UP):
@@ -94,6 +117,42 @@ class Buffalo:
         self.direction = direction
         self.rect = pygame.Rect(xy, (Buffalo.width, Buffalo.height))
 
+# A list of rects, kept from tick to tick, for collision queries. Rects are referenced by their index.
+# A `collidelist` scan runs in C, and is cheaper than any Python broad phase up to the most buffalo the main area can
+# hold, so this is only a list. What it saves is building the list again for every query.
+class RectList:
+    def __init__(self):
+        self.rects = []
+
+    # Returns the new rect's index.
+    def insert(self, rect):
+        self.rects.append(rect)
+
+        return len(self.rects) - 1
+
+    # Removes the rect at `index`. Like `list.pop`, the indices of the rects after it shift down by one.
+    def pop(self, index):
+        self.rects.pop(index)
+
+    def move(self, index, rect):
+        self.rects[index] = rect
+
+    # Same result as `rect.collidelist(rects)`, the index of the *first* colliding rect or -1,
+    # optionally ignoring the rect at `excluding_index`.
+    def collidelist(self, rect, excluding_index = None):
+        if excluding_index is None:
+            return rect.collidelist(self.rects)
+
+        # An empty rect never collides, so swap it in for the excluded rect for the duration of the scan.
+        excluded_rect = self.rects[excluding_index]
+        self.rects[excluding_index] = _EMPTY_RECT
+        first_index = rect.collidelist(self.rects)
+        self.rects[excluding_index] = excluded_rect
+
+        return first_index
+
+_EMPTY_RECT = pygame.Rect(0, 0, 0, 0)
+
 MAIN_SURFACE_SIZE = (960, 540)
 FOOTER_SURFACE_SIZE = (MAIN_SURFACE_SIZE[0], 40)
 SCREEN_SIZE = (MAIN_SURFACE_SIZE[0], MAIN_SURFACE_SIZE[1] + FOOTER_SURFACE_SIZE[1])
@@ -110,6 +169,103 @@ INVISIBLE_WALLS = [
     pygame.Rect(MAIN_SURFACE_SIZE[0], - Hunter.height, Hunter.width, MAIN_SURFACE_SIZE[1] + Hunter.height * 2),
 ]
 
+# The `k` nearest of the `candidates` rows, by distance, nearest first. Same order as a stable sort,
+# so ties stay in row order, but only the rows that can make the cut get sorted.
+def _nearest_rows(distances, candidates, k):
+    rows = numpy.flatnonzero(candidates)
+    if len(rows) > k:
+        kth_distance = numpy.partition(distances[rows], k - 1)[k - 1]
+        rows = rows[distances[rows] <= kth_distance]
+
+    return rows[numpy.argsort(distances[rows], kind = "stable")[:k]]
+
+# What the AI senses: the centers and sizes of the obstacles, invisible walls, and buffalo, kept in NumPy arrays
+# and updated as buffalo spawn, move, and die, so nearest-entity queries don't rebuild anything.
+#
+# Rows are the static rects first, in the order given, then each buffalo by its index in `Game.buffalos`.
+# A buffalo row counts as a living buffalo or, once dead, as an obstacle.
+class Sensors:
+    # Up to this many rows, one stable sort of every row is cheaper than partitioning out the nearest of each kind.
+    MAX_ROWS_TO_SORT = 64
+
+    def __init__(self, static_rects):
+        self.num_static_rects = len(static_rects)
+        self.num_rows = self.num_static_rects
+
+        capacity = self.num_static_rects + 16
+        self.centers = numpy.zeros((capacity, 2), dtype = numpy.int64)
+        self.sizes = numpy.zeros((capacity, 2), dtype = numpy.int64)
+        self.directions = numpy.zeros(capacity, dtype = numpy.int64)
+        self.alive = numpy.zeros(capacity, dtype = bool)
+        self.obstacle = numpy.zeros(capacity, dtype = bool)
+
+        for row, rect in enumerate(static_rects):
+            self.centers[row] = rect.center
+            self.sizes[row] = rect.size
+            self.obstacle[row] = True
+
+    def add_buffalo(self, buffalo):
+        if self.num_rows == len(self.centers):
+            for attribute_name in ["centers", "sizes", "directions", "alive", "obstacle"]:
+                values = getattr(self, attribute_name)
+                setattr(self, attribute_name, numpy.concatenate([values, numpy.zeros_like(values)]))
+
+        self.centers[self.num_rows] = buffalo.rect.center
+        self.sizes[self.num_rows] = buffalo.rect.size
+        self.directions[self.num_rows] = buffalo.direction
+        self.alive[self.num_rows] = buffalo.alive
+        self.obstacle[self.num_rows] = not buffalo.alive
+        self.num_rows += 1
+
+    def move_buffalo(self, buffalo_index, rect):
+        self.centers[self.num_static_rects + buffalo_index] = rect.center
+
+    def turn_buffalo(self, buffalo_index, direction):
+        self.directions[self.num_static_rects + buffalo_index] = direction
+
+    def kill_buffalo(self, buffalo_index):
+        self.alive[self.num_static_rects + buffalo_index] = False
+        self.obstacle[self.num_static_rects + buffalo_index] = True
+
+    # Returns (offsets of every row from `center`, nearest living buffalo rows, nearest obstacle rows).
+    def nearest(self, center, num_buffalos, num_obstacles):
+        offsets = self.centers[:self.num_rows] - center
+        distances = numpy.einsum("ij,ij->i", offsets, offsets)
+
+        if self.num_rows <= Sensors.MAX_ROWS_TO_SORT:
+            rows = numpy.argsort(distances, kind = "stable")
+            return (
+                offsets,
+                rows[self.alive[rows]][:num_buffalos],
+                rows[self.obstacle[rows]][:num_obstacles],
+            )
+
+        return (
+            offsets,
+            _nearest_rows(distances, self.alive[:self.num_rows], num_buffalos),
+            _nearest_rows(distances, self.obstacle[:self.num_rows], num_obstacles),
+        )
+
+# A tick's action is a small int bitfield of the keys pressed, one bit per key, in this order. It's the same
+# WSAD + ENTER + SPACE order as a brain's outputs, so a brain's move converts to an action with a dot product.
+ACTION_KEYS = [pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d, pygame.K_RETURN, pygame.K_SPACE]
+ACTION_UP, ACTION_DOWN, ACTION_LEFT, ACTION_RIGHT, ACTION_TOGGLE_MOVING, ACTION_FIRE = [1 << bit for bit in range(len(ACTION_KEYS))]
+_ACTION_BITS_BY_KEY = dict(zip(ACTION_KEYS, [1 << bit for bit in range(len(ACTION_KEYS))]))
+
+# Converts a list of every key's pressed state, indexed by key, such as `pygame.key.get_pressed()`, to an action.
+def action_from_keys_pressed(keys_pressed):
+    action = 0
+    for key, bit in _ACTION_BITS_BY_KEY.items():
+        if keys_pressed[key]:
+            action |= bit
+
+    return action
+
+# Converts a (N, len(ACTION_KEYS)) boolean array, one row of pressed outputs per brain, such as
+# `ai.Population.compute_next_moves` returns, to a list of N actions.
+def actions_from_moves(moves):
+    return numpy.dot(numpy.asarray(moves, dtype = numpy.int64), 1 << numpy.arange(len(ACTION_KEYS))).tolist()
+
 # 60 seconds, assuming 15 ticks per second.
 GAME_MAX_TICKS = 60 * 15
 
@@ -150,28 +306,89 @@ BUFFALO_SPAWN_AREAS = [
 BUFFALO_CHANGE_DIRECTION_AVG_TICKS = 1 * 15
 
 class Game:
-    def __init__(self):
+    # Every random draw comes from the game's own generator, so the seed, plus the keys pressed each tick,
+    # defines the whole episode. With no seed, a fresh one is drawn from the OS. It's a `random.Random` rather than
+    # a NumPy generator because the game draws one number at a time, where NumPy's per call overhead dominates.
+    # If `record` is True, the game also keeps each tick's action, so it can be replayed. See `replay.Recording`.
+    def __init__(self, seed = None, record = False):
+        self.seed = seed if seed is not None else numpy.random.SeedSequence().entropy
+        self.rng = random.Random(self.seed)
+        self.recorded_actions = bytearray() if record else None
         self.buffalos = []
+        # Indices in `self.buffalos` of the living buffalo, in spawn order, so moving them skips the dead.
+        self._living_buffalo_indices = []
+        # Living buffalo's rects, in the same order. Kept in step as buffalo spawn, move, and die.
+        self._living_buffalo_rects = RectList()
+        # Dead buffalo never move again, so they're filed once, when they die, as obstacles in a list of their own.
+        # Their indices are in order of death, so this maps them back to indices in `self.buffalos`.
+        self._dead_buffalo_rects = RectList()
+        self._dead_buffalo_indices = []
         self.bullets = []
         self.hunter = Hunter()
-        self.keys_pressed = [False for ascii_key_index in range(128)]
+        self.action = 0
         self.obstacles = [
             pygame.Rect(
-                random.choice(range(Hunter.width, MAIN_SURFACE_SIZE[0] - 80)),
-                random.choice(range(Hunter.height, MAIN_SURFACE_SIZE[1] - 80)),
+                self.rng.choice(range(Hunter.width, MAIN_SURFACE_SIZE[0] - 80)),
+                self.rng.choice(range(Hunter.height, MAIN_SURFACE_SIZE[1] - 80)),
                 80, 80
             )
         ]
+        self.sensors = Sensors(self.obstacles + INVISIBLE_WALLS)
         self.ticks = 0
         self.score = 0
 
-    def tick(self, keys_pressed):
+    def spawn_buffalo(self, buffalo):
+        buffalo_index = len(self.buffalos)
+        self.buffalos.append(buffalo)
+        self.sensors.add_buffalo(buffalo)
+
+        if buffalo.alive:
+            self._living_buffalo_indices.append(buffalo_index)
+            self._living_buffalo_rects.insert(buffalo.rect)
+        else:
+            self._dead_buffalo_rects.insert(buffalo.rect)
+            self._dead_buffalo_indices.append(buffalo_index)
+
+    def _kill_buffalo(self, buffalo_index):
+        buffalo = self.buffalos[buffalo_index]
+        buffalo.alive = False
+        self.sensors.kill_buffalo(buffalo_index)
+
+        living_index = self._living_buffalo_indices.index(buffalo_index)
+        self._living_buffalo_indices.pop(living_index)
+        self._living_buffalo_rects.pop(living_index)
+        self._dead_buffalo_rects.insert(buffalo.rect)
+        self._dead_buffalo_indices.append(buffalo_index)
+
+    # Same as `rect.collidelist` over every buffalo, dead or alive: the index in `self.buffalos` of the *first*
+    # buffalo `rect` overlaps, or -1.
+    def _buffalos_collidelist(self, rect):
+        living_index = self._living_buffalo_rects.collidelist(rect)
+        first_index = self._living_buffalo_indices[living_index] if living_index != -1 else -1
+
+        # Overlapping a dead buffalo is rare, so only then look for the earliest spawned one.
+        if self._dead_buffalo_rects.collidelist(rect) != -1:
+            first_dead_index = min(
+                self._dead_buffalo_indices[dead_index] for dead_index in rect.collidelistall(self._dead_buffalo_rects.rects)
+            )
+            if first_index == -1 or first_dead_index < first_index:
+                first_index = first_dead_index
+
+        return first_index
+
+    # Takes an action bitfield, or, the legacy way, a list of every key's pressed state, indexed by key.
+    def tick(self, action):
+        if not isinstance(action, (int, numpy.integer)):
+            action = action_from_keys_pressed(action)
+
         self.ticks += 1
         if self.ticks >= GAME_MAX_TICKS:
             return False
 
         # Remember key presses for later rendering.
-        self.keys_pressed = keys_pressed
+        self.action = action
+        if self.recorded_actions is not None:
+            self.recorded_actions.append(action)
 
         # Move bullets.
         diagonal_px_per_tick = (Bullet.speed_px_per_tick ** 2 / 2) ** 0.5
@@ -203,9 +420,12 @@ class Game:
 
         # Move living buffalo.
         diagonal_px_per_tick = (Buffalo.speed_px_per_tick ** 2 / 2) ** 0.5
-        for buffalo in filter(lambda buffalo: buffalo.alive, self.buffalos):
-            if random.randrange(BUFFALO_CHANGE_DIRECTION_AVG_TICKS) == 0:
-                buffalo.direction = random.randrange(8) # One of eight direction enums.
+        for living_index, buffalo_index in enumerate(self._living_buffalo_indices):
+            buffalo = self.buffalos[buffalo_index]
+
+            if self.rng.randrange(BUFFALO_CHANGE_DIRECTION_AVG_TICKS) == 0:
+                buffalo.direction = self.rng.randrange(8) # One of eight direction enums.
+                self.sensors.turn_buffalo(buffalo_index, buffalo.direction)
 
             match buffalo.direction:
                 case Direction.UP:
@@ -236,23 +456,26 @@ class Game:
             def buffalo_collision():
                 if moved_buffalo_rect.colliderect(self.hunter.rect):
                     return True
-                other_buffalo_rects = [other_buffalo.rect for other_buffalo in self.buffalos if not other_buffalo is buffalo]
-                if moved_buffalo_rect.collidelist(other_buffalo_rects) != -1:
+                if self._living_buffalo_rects.collidelist(moved_buffalo_rect, living_index) != -1:
+                    return True
+                if self._dead_buffalo_rects.collidelist(moved_buffalo_rect) != -1:
                     return True
                 if moved_buffalo_rect.collidelist(self.obstacles) != -1:
                     return True
                 return False
             if not buffalo_collision():
+                self._living_buffalo_rects.move(living_index, moved_buffalo_rect)
+                self.sensors.move_buffalo(buffalo_index, moved_buffalo_rect)
                 buffalo.rect = moved_buffalo_rect
 
         # Remove expired or colliding bullets.
         # WARNING! This filter predicate has a side-effect on the buffalo.
         # If the bullet collides with the buffalo, the buffalo dies.
         def bullet_collision(bullet):
-            colliding_buffalo_index = bullet.rect.collidelist([buffalo.rect for buffalo in self.buffalos])
+            colliding_buffalo_index = self._buffalos_collidelist(bullet.rect)
             if colliding_buffalo_index != -1:
                 if self.buffalos[colliding_buffalo_index].alive:
-                    self.buffalos[colliding_buffalo_index].alive = False
+                    self._kill_buffalo(colliding_buffalo_index)
                     self.score += 1000
                 return True
             if bullet.rect.collidelist(self.obstacles) != -1:
@@ -266,33 +489,34 @@ class Game:
         ]
 
         # Randomly generate new bufflo.
-        if random.randrange(BUFFALO_SPAWN_AVG_TICKS) == 0:
-            spawn_area = random.choice(BUFFALO_SPAWN_AREAS)
-            self.buffalos.append(Buffalo(
-                (random.choice(spawn_area["x"]), random.choice(spawn_area["y"])),
+        if self.rng.randrange(BUFFALO_SPAWN_AVG_TICKS) == 0:
+            spawn_area = self.rng.choice(BUFFALO_SPAWN_AREAS)
+            self.spawn_buffalo(Buffalo(
+                (self.rng.choice(spawn_area["x"]), self.rng.choice(spawn_area["y"])),
                 spawn_area["direction"]
             ))
 
         # Update hunter direction.
-        if keys_pressed[pygame.K_w] and keys_pressed[pygame.K_d]:
+        up, down, left, right = action & ACTION_UP, action & ACTION_DOWN, action & ACTION_LEFT, action & ACTION_RIGHT
+        if up and right:
             self.hunter.direction = Direction.UP_RIGHT
-        elif keys_pressed[pygame.K_s] and keys_pressed[pygame.K_d]:
+        elif down and right:
             self.hunter.direction = Direction.DOWN_RIGHT
-        elif keys_pressed[pygame.K_s] and keys_pressed[pygame.K_a]:
+        elif down and left:
             self.hunter.direction = Direction.DOWN_LEFT
-        elif keys_pressed[pygame.K_w] and keys_pressed[pygame.K_a]:
+        elif up and left:
             self.hunter.direction = Direction.UP_LEFT
-        elif keys_pressed[pygame.K_w]:
+        elif up:
             self.hunter.direction = Direction.UP
-        elif keys_pressed[pygame.K_d]:
+        elif right:
             self.hunter.direction = Direction.RIGHT
-        elif keys_pressed[pygame.K_s]:
+        elif down:
             self.hunter.direction = Direction.DOWN
-        elif keys_pressed[pygame.K_a]:
+        elif left:
             self.hunter.direction = Direction.LEFT
 
         # Start/stop moving.
-        if keys_pressed[pygame.K_RETURN]:
+        if action & ACTION_TOGGLE_MOVING:
             self.hunter.moving = not self.hunter.moving
 
         # Move hunter.
@@ -326,7 +550,9 @@ class Game:
 
             # Immediately invoked function for early returns.
             def hunter_collision():
-                if moved_hunter_rect.collidelist([buffalo.rect for buffalo in self.buffalos]) != -1:
+                if self._living_buffalo_rects.collidelist(moved_hunter_rect) != -1:
+                    return True
+                if self._dead_buffalo_rects.collidelist(moved_hunter_rect) != -1:
                     return True
                 if moved_hunter_rect.collidelist(INVISIBLE_WALLS) != -1:
                     return True
@@ -340,7 +566,7 @@ class Game:
                 self.score += 1
 
         # Fire bullet.
-        if keys_pressed[pygame.K_SPACE]:
+        if action & ACTION_FIRE:
             match self.hunter.direction:
                 case Direction.UP:
                     bullet_xy = (self.hunter.rect.x + 36, self.hunter.rect.y)
@@ -373,75 +599,160 @@ class Game:
 
         return True
 
-    def render(self):
-        main_surface = pygame.Surface(MAIN_SURFACE_SIZE)
-        main_surface.fill("black")
-        main_surface.blit(
-            hunter_sprite,
-            self.hunter.rect,
-            # Sprite revealing window area.
-            pygame.Rect(Hunter.width * self.hunter.direction, 15, Hunter.width, Hunter.height)
-        )
+    # Draws the game into `target`, or if None into a surface shared by every game. WARNING! The shared surface is only
+    # valid until the next `render` call, of any game, at the same scale, so blit it somewhere before rendering again.
+    # `scale` shrinks everything, such as to draw straight into a gallery tile without rendering at full size first.
+    def render(self, target = None, scale = 1):
+        render_cache = _render_cache(scale)
+        if target is None:
+            target = render_cache["render_surface"]
+        target.blit(render_cache["background_surface"], (0, 0))
+
+        # Sprites near the bottom edge shouldn't spill over into the footer.
+        footer_top = _scale_xy((0, MAIN_SURFACE_SIZE[1]), scale)[1]
+        target_clip = target.get_clip()
+        target.set_clip(target_clip.clip(pygame.Rect(0, 0, target.get_width(), footer_top)))
+        target.blit(render_cache["hunter_sprites"][self.hunter.direction], _scale_xy(self.hunter.rect.topleft, scale))
         for bullet in self.bullets:
-            pygame.draw.circle(main_surface, "white", (bullet.rect.x, bullet.rect.y), 2)
+            # The bullet sprite is centered on the bullet's top left.
+            target.blit(render_cache["bullet_sprite"], _scale_xy((bullet.rect.x - 2, bullet.rect.y - 2), scale))
         for buffalo in self.buffalos:
-            transformed_buffalo = buffalo_img
-            match buffalo.direction:
-                case Direction.UP | Direction.UP_RIGHT | Direction.RIGHT | Direction.DOWN_RIGHT:
-                    transformed_buffalo = pygame.transform.flip(transformed_buffalo, True, False)
-            if not buffalo.alive:
-                transformed_buffalo = pygame.transform.flip(transformed_buffalo, False, True)
-            main_surface.blit(transformed_buffalo, buffalo.rect)
+            facing_right = buffalo.direction in (Direction.UP, Direction.UP_RIGHT, Direction.RIGHT, Direction.DOWN_RIGHT)
+            target.blit(render_cache["buffalo_sprites"][(facing_right, buffalo.alive)], _scale_xy(buffalo.rect.topleft, scale))
         for obstacle in self.obstacles:
-            main_surface.blit(
-                obstacles_deer_sprite,
-                obstacle,
-                # Sprite revealing window area.
-                pygame.Rect(66, 125, 80, 80)
-            )
-        pygame.draw.lines(
-            main_surface,
-            "white",
-            True,
-            [
-                (0, 0),
-                (MAIN_SURFACE_SIZE[0] - 1, 0),
-                (MAIN_SURFACE_SIZE[0] - 1, MAIN_SURFACE_SIZE[1] - 1),
-                (0, MAIN_SURFACE_SIZE[1] - 1)
-            ]
-        )
-
-        footer_surface = pygame.Surface(FOOTER_SURFACE_SIZE)
-        footer_surface.fill("black")
-        if Game._keypress_rects_labels_cache:
-            keypress_rects_labels = Game._keypress_rects_labels_cache
-        else:
-            button_label_font = pygame.font.SysFont("monospace", 12)
-            keypress_rects_labels = [
-                (pygame.K_w, pygame.Rect(40, 4, 25, 15), button_label_font.render("w", False, "white")),
-                (pygame.K_a, pygame.Rect(10, 21, 25, 15), button_label_font.render("a", False, "white")),
-                (pygame.K_s, pygame.Rect(40, 21, 25, 15), button_label_font.render("s", False, "white")),
-                (pygame.K_d, pygame.Rect(70, 21, 25, 15), button_label_font.render("d", False, "white")),
-                (pygame.K_SPACE, pygame.Rect(115, 7, 100, 26), button_label_font.render("space", False, "white")),
-                (pygame.K_RETURN, pygame.Rect(235, 7, 50, 26), button_label_font.render("enter", False, "white")),
-            ]
-            Game._keypress_rects_labels_cache = keypress_rects_labels
-        for key, rect, label in keypress_rects_labels:
-            pygame.draw.rect(footer_surface, "white", rect, width = 0 if self.keys_pressed[key] else 1, border_radius = 2)
-            footer_surface.blit(label, (rect.x + rect.width / 2 - label.get_width() / 2, rect.y + rect.height / 2 - label.get_height() / 2))
-        footer_surface.blit(pygame.font.SysFont("monospace", 18).render(f"SCORE: {self.score}", False, "white"), (720, 10))
-        footer_surface.blit(
-            pygame.font.SysFont("monospace", 18).render(
-                f"0:{round((GAME_MAX_TICKS - self.ticks) * 60 // GAME_MAX_TICKS):02d}", False, "white"
-            ),
-            (880, 10)
-        )
+            target.blit(render_cache["obstacle_sprite"], _scale_xy(obstacle.topleft, scale))
+        for strip, xy in render_cache["border_strips"]:
+            target.blit(strip, xy)
+        target.set_clip(target_clip)
 
-        render_surface = pygame.Surface(SCREEN_SIZE)
-        render_surface.blit(main_surface, (0, 0))
-        render_surface.blit(footer_surface, (0, MAIN_SURFACE_SIZE[1]))
+        for key, xy, button_sprites in render_cache["button_sprites"]:
+            target.blit(button_sprites[bool(self.action & _ACTION_BITS_BY_KEY[key])], xy)
+        _blit_text(target, render_cache, f"SCORE: {self.score}", _scale_xy((720, 10), scale), footer_top)
+        _blit_text(target, render_cache, f"0:{round((GAME_MAX_TICKS - self.ticks) * 60 // GAME_MAX_TICKS):02d}", _scale_xy((880, 10), scale), footer_top)
 
-        return render_surface
+        return target
 
     # Font render was expensive in the profiler, so cache the static button labels.
     _keypress_rects_labels_cache = None
+
+# Surfaces, sprites, fonts, and text shared by every game's `render`, by scale. Allocating, flipping, and scaling
+# these per frame was expensive in the profiler. Everything is drawn at full size first and scaled down once, so
+# small renders look like a shrunken full size render. At full scale, nothing is resampled.
+_render_caches = {}
+
+def _render_cache(scale):
+    if scale in _render_caches:
+        return _render_caches[scale]
+
+    background_surface = pygame.Surface(SCREEN_SIZE)
+    background_surface.fill("black")
+
+    # The border around the main area is static too, but sprites go under it, so it's drawn last. Blitting a whole
+    # transparent overlay costs more than the rest of a frame, so keep just a strip along each edge.
+    border_surface = pygame.Surface(MAIN_SURFACE_SIZE, pygame.SRCALPHA)
+    pygame.draw.lines(
+        border_surface,
+        "white",
+        True,
+        [
+            (0, 0),
+            (MAIN_SURFACE_SIZE[0] - 1, 0),
+            (MAIN_SURFACE_SIZE[0] - 1, MAIN_SURFACE_SIZE[1] - 1),
+            (0, MAIN_SURFACE_SIZE[1] - 1)
+        ]
+    )
+
+    border_surface = _scale_sprite(border_surface, scale)
+    # Scaling down can blur the line into the next pixel in.
+    border_width = 2
+    border_strips = [
+        (border_surface.subsurface(rect), rect.topleft) for rect in [
+            pygame.Rect(0, 0, border_surface.get_width(), border_width),
+            pygame.Rect(0, border_surface.get_height() - border_width, border_surface.get_width(), border_width),
+            # The sides skip the corners, which the top and bottom already cover.
+            pygame.Rect(0, border_width, border_width, border_surface.get_height() - border_width * 2),
+            pygame.Rect(border_surface.get_width() - border_width, border_width, border_width, border_surface.get_height() - border_width * 2),
+        ]
+    ]
+
+    sprite_sheets = _load_sprite_sheets()
+
+    bullet_sprite = pygame.Surface((5, 5), pygame.SRCALPHA)
+    pygame.draw.circle(bullet_sprite, "white", (2, 2), 2)
+
+    if not Game._keypress_rects_labels_cache:
+        button_label_font = pygame.font.SysFont("monospace", 12)
+        Game._keypress_rects_labels_cache = [
+            (pygame.K_w, pygame.Rect(40, 4, 25, 15), button_label_font.render("w", False, "white")),
+            (pygame.K_a, pygame.Rect(10, 21, 25, 15), button_label_font.render("a", False, "white")),
+            (pygame.K_s, pygame.Rect(40, 21, 25, 15), button_label_font.render("s", False, "white")),
+            (pygame.K_d, pygame.Rect(70, 21, 25, 15), button_label_font.render("d", False, "white")),
+            (pygame.K_SPACE, pygame.Rect(115, 7, 100, 26), button_label_font.render("space", False, "white")),
+            (pygame.K_RETURN, pygame.Rect(235, 7, 50, 26), button_label_font.render("enter", False, "white")),
+        ]
+    # Each button, with its label, by whether its key is pressed.
+    button_sprites = []
+    for key, rect, label in Game._keypress_rects_labels_cache:
+        sprites = {}
+        for pressed in (False, True):
+            sprite = pygame.Surface(rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(sprite, "white", sprite.get_rect(), width = 0 if pressed else 1, border_radius = 2)
+            sprite.blit(label, (rect.width / 2 - label.get_width() / 2, rect.height / 2 - label.get_height() / 2))
+            sprites[pressed] = _scale_sprite(sprite, scale)
+        button_sprites.append((key, _scale_xy((rect.x, MAIN_SURFACE_SIZE[1] + rect.y), scale), sprites))
+
+    render_cache = {
+        "render_surface": pygame.Surface(_scale_size(SCREEN_SIZE, scale)),
+        "background_surface": _scale_sprite(background_surface, scale),
+        "border_strips": border_strips,
+        "hunter_sprites": [
+            # Sprite revealing window area.
+            _scale_sprite(sprite_sheets["hunter"].subsurface(pygame.Rect(Hunter.width * direction, 15, Hunter.width, Hunter.height)), scale)
+                for direction in range(Direction.UP_LEFT + 1)
+        ],
+        "bullet_sprite": _scale_sprite(bullet_sprite, scale),
+        "buffalo_sprites": {orientation: _scale_sprite(sprite, scale) for orientation, sprite in sprite_sheets["buffalos"].items()},
+        # Sprite revealing window area.
+        "obstacle_sprite": _scale_sprite(sprite_sheets["obstacles_deer"].subsurface(pygame.Rect(66, 125, 80, 80)), scale),
+        "button_sprites": button_sprites,
+        "scale": scale,
+        "font": pygame.font.SysFont("monospace", 18),
+        # Rendered scores and timers, by text.
+        "text_surfaces": {},
+    }
+    _render_caches[scale] = render_cache
+
+    return render_cache
+
+def _scale_sprite(surface, scale):
+    if scale == 1:
+        return surface
+
+    # Smoothscale only takes 24 and 32 bit surfaces, but text renders to 8 bit.
+    if surface.get_bitsize() < 24:
+        converted_surface = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        converted_surface.blit(surface, (0, 0))
+        surface = converted_surface
+
+    return pygame.transform.smoothscale(surface, _scale_size(surface.get_size(), scale))
+
+def _scale_xy(xy, scale):
+    return (int(xy[0] * scale), int(xy[1] * scale))
+
+def _scale_size(size, scale):
+    return (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+
+# Most frames draw a score or timer some game at the same scale already drew, so keep the rendered strings. Rendering
+# whole strings, rather than glyph by glyph, keeps each character where the font puts it, monospace or not.
+# `xy` is relative to the footer.
+def _blit_text(surface, render_cache, text, xy, footer_top):
+    text_surfaces = render_cache["text_surfaces"]
+    if text not in text_surfaces:
+        # Scores only grow, so old ones are rarely drawn again. Start over rather than keep every one.
+        if len(text_surfaces) >= _MAX_TEXT_SURFACES:
+            text_surfaces.clear()
+        text_surfaces[text] = _scale_sprite(render_cache["font"].render(text, False, "white"), render_cache["scale"])
+
+    surface.blit(text_surfaces[text], (xy[0], xy[1] + footer_top))
+
+_MAX_TEXT_SURFACES = 1024
@@ -0,0 +1,209 @@
+import ai
+import training
+
+import functools
+import io
+import json
+import multiprocessing
+import numpy
+import queue
+import socket
+import sys
+import threading
+import time
+
+# Island model training. Several populations, the islands, each evolve on their own with the same selection loop as
+# `training.train`, in their own process, or on their own host. Every `migrate_every` generations, each island sends
+# copies of its fittest brains to the next island around a ring, and every generation, it takes in whatever brains
+# have arrived from the island before it, in place of some of its children. Islands never wait on each other, so
+# they scale across cores and hosts with next to no synchronization. But when migrants arrive depends on timing, so
+# unlike `training.train`, a seeded island run doesn't exactly reproduce.
+
+# Migrants travel as a (number of migrants, GENOME_LENGTH) array of genomes, like a checkpoint's.
+
+# Each island has a queue, and other islands put migrants on it. For islands that are processes on one machine.
+class QueueTransport:
+    def __init__(self, queues, island_index):
+        self.queues = queues
+        self.island_index = island_index
+
+    def send(self, destination_index, genomes):
+        self.queues[destination_index].put(genomes)
+
+    # Every batch of migrants that's arrived so far, without waiting for more.
+    def receive(self):
+        genomes_batches = []
+        while True:
+            try:
+                genomes_batches.append(self.queues[self.island_index].get_nowait())
+            except queue.Empty:
+                return genomes_batches
+
+    def close(self):
+        pass
+
+# Each island listens on its own (host, port), and other islands connect to send migrants, one batch per connection,
+# as a .npy file. Runs on one machine with localhost addresses, or across hosts, with no other services needed.
+class TcpTransport:
+    # How long to wait on a connection to another island before giving up on it.
+    TIMEOUT_SECONDS = 10
+
+    def __init__(self, addresses, island_index):
+        self.addresses = addresses
+        self.island_index = island_index
+        self._received = queue.Queue()
+        self._server = socket.create_server(addresses[island_index])
+        threading.Thread(target = self._accept_connections, daemon = True).start()
+
+    def _accept_connections(self):
+        while True:
+            try:
+                connection, address = self._server.accept()
+            except OSError:
+                # Closed.
+                return
+
+            with connection:
+                connection.settimeout(TcpTransport.TIMEOUT_SECONDS)
+                try:
+                    chunks = []
+                    while chunk := connection.recv(1 << 16):
+                        chunks.append(chunk)
+                    genomes = numpy.load(io.BytesIO(b"".join(chunks)), allow_pickle = False)
+                    # Any peer can connect, such as one running an older version with a different genome, and one bad
+                    # batch shouldn't take down this island's training, so check its genomes before taking it in.
+                    if not (
+                        genomes.ndim == 2
+                        and genomes.shape[1] == ai.GENOME_LENGTH
+                        and numpy.issubdtype(genomes.dtype, numpy.floating)
+                        and numpy.isfinite(genomes).all()
+                    ):
+                        raise ValueError(f"not a batch of finite genomes: {genomes.dtype} array of shape {genomes.shape}")
+                    self._received.put(genomes)
+                except (OSError, ValueError) as error:
+                    print(f"island {self.island_index}: dropped migrants from {address}: {error}", file = sys.stderr)
+
+    # Migration is best effort. If the next island isn't listening, such as before it starts or after it finishes,
+    # these migrants are dropped, and training carries on.
+    def send(self, destination_index, genomes):
+        payload = io.BytesIO()
+        numpy.save(payload, genomes, allow_pickle = False)
+        try:
+            with socket.create_connection(self.addresses[destination_index], timeout = TcpTransport.TIMEOUT_SECONDS) as connection:
+                connection.sendall(payload.getvalue())
+        except OSError as error:
+            print(f"island {self.island_index}: dropped migrants to island {destination_index}: {error}", file = sys.stderr)
+
+    def receive(self):
+        genomes_batches = []
+        while True:
+            try:
+                genomes_batches.append(self._received.get_nowait())
+            except queue.Empty:
+                return genomes_batches
+
+    def close(self):
+        self._server.close()
+
+# (host, port) for each of `num_islands` islands on this machine, on consecutive ports.
+def localhost_addresses(num_islands, first_port):
+    return [("127.0.0.1", first_port + island_index) for island_index in range(num_islands)]
+
+# Parses "host:port,host:port,...", one address per island, in island order.
+def parse_addresses(addresses):
+    return [(host, int(port)) for host, port in (address.rsplit(":", 1) for address in addresses.split(","))]
+
+# Runs one island, until `generations` generations have been played, or forever if None, and returns its last
+# generation's brains. `create_transport(island_index)` makes the island's transport, in the island's own process.
+# Writes one JSON line of stats per generation to `stats_path`, or stdout if None. Each island draws its random
+# numbers from its own child of `seed`, so islands on different hosts, given the same seed, still differ.
+def run_island(
+    island_index,
+    num_islands,
+    create_transport,
+    generations = None,
+    population_size = training.POPULATION_SIZE,
+    engine = "batch",
+    migrate_every = 5,
+    num_migrants = 4,
+    seed = None,
+    stats_path = None
+):
+    rng = numpy.random.default_rng(numpy.random.SeedSequence(seed).spawn(num_islands)[island_index])
+    brains = ai.mutate_population([ai.Brain()], population_size, rng)
+    play_episodes = training.ENGINES[engine]
+    transport = create_transport(island_index)
+    stats_stream = open(stats_path, "a") if stats_path else sys.stdout
+
+    try:
+        generation = 0
+        while generations is None or generation < generations:
+            generation_started = time.perf_counter()
+            scores = play_episodes(brains, seeds = training.episode_seeds(rng, len(brains)))
+            generation += 1
+
+            if num_islands > 1 and generation % migrate_every == 0:
+                fittest_indices = sorted(range(len(brains)), key = lambda index: scores[index], reverse = True)[:num_migrants]
+                transport.send((island_index + 1) % num_islands, ai.stack_genomes([brains[index] for index in fittest_indices]))
+
+            stats = training.generation_stats(brains, scores)
+            next_brains = training.next_generation(brains, scores, rng)
+
+            # Migrants take the place of the last children, and compete in the next generation like any other brain.
+            # They never crowd out more than the children, so this island's own fittest always carry on.
+            # With no children, there's no room for any, and `[-0:]` would take them all, so slice from the front.
+            num_children = len(next_brains) - training.num_fittest(len(next_brains))
+            immigrants = [
+                brain for genomes in transport.receive() for brain in ai.brains_from_genomes(genomes.astype(ai.GENOME_DTYPE))
+            ]
+            immigrants = immigrants[max(len(immigrants) - num_children, 0):]
+            if immigrants:
+                next_brains[len(next_brains) - len(immigrants):] = immigrants
+
+            print(json.dumps({
+                "island": island_index,
+                "generation": generation,
+                **stats,
+                "best_score": max(scores),
+                "immigrants": len(immigrants),
+                "seconds": round(time.perf_counter() - generation_started, 3),
+            }), file = stats_stream, flush = True)
+
+            brains = next_brains
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        transport.close()
+        if stats_stream is not sys.stdout:
+            stats_stream.close()
+
+    return brains
+
+# Runs `num_islands` islands, each in its own process on this machine, connected by `transport`, "queue" or "tcp".
+# TCP islands listen on localhost, from `first_port` up. Waits for every island to finish.
+def run(num_islands, transport = "queue", first_port = 47000, **island_arguments):
+    # Like `parallel`, spawn rather than fork, so islands don't inherit a pygame display.
+    mp_context = multiprocessing.get_context("spawn")
+    if transport == "queue":
+        # Manager queues, like `parallel`'s snapshot queue, so an island that finishes with migrants still on the
+        # way never blocks flushing them.
+        manager = mp_context.Manager()
+        create_transport = functools.partial(QueueTransport, [manager.Queue() for _ in range(num_islands)])
+    else:
+        create_transport = functools.partial(TcpTransport, localhost_addresses(num_islands, first_port))
+
+    processes = [
+        mp_context.Process(target = run_island, args = (island_index, num_islands, create_transport), kwargs = island_arguments)
+            for island_index in range(num_islands)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # The islands got the same Ctrl-C, and are wrapping up.
+        for process in processes:
+            process.join()
@@ -1,20 +1,158 @@
 import ai
+import benchmark
+import brain_graph
+import chart
+import checkpoint
 import game as gamex
-
+import islands
+import parallel
+import profiling
+import replay
+import scheduler
+import training
+
+import argparse
 import cProfile
 from datetime import datetime, timedelta
+import functools
 import math
-import matplotlib.pyplot
+import numpy
 import os
 import pstats
 import pygame
 import subprocess
+import sys
 import tempfile
-from timeit import timeit
 
 def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument(
+        "--render-budget", type = float, default = 0.2,
+        help = "when training, the fraction of wall time that drawing frames may use (default: 0.2)"
+    )
+    argument_parser.add_argument(
+        "--gallery-tiles-per-frame", type = int, default = 36,
+        help = "when training, redraw at most this many gallery games per frame, round-robin (default: 36)"
+    )
+    add_run_arguments(argument_parser)
+    subparsers = argument_parser.add_subparsers(dest = "command")
+
+    train_parser = subparsers.add_parser("train", help = "train the AI with no window, and print each generation's stats")
+    train_parser.add_argument("--generations", type = int, default = None, help = "stop after this many generations (default: run until Ctrl-C)")
+    train_parser.add_argument("--population", type = int, default = training.POPULATION_SIZE, help = "brains per generation")
+    train_parser.add_argument(
+        "--engine", choices = list(training.ENGINES), default = "batch",
+        help = "play games all at once with BatchGame, or one Game object per brain"
+    )
+    train_parser.add_argument("--stats-file", default = None, help = "append each generation's stats as JSON lines to this file (default: stdout)")
+    train_parser.add_argument(
+        "--scenarios", type = int, default = None,
+        help = "play this many fixed games, one per brain, picked by its weights, rather than a fresh game each generation"
+    )
+    train_parser.add_argument(
+        "--fitness-cache", type = int, default = 0,
+        help = "with --scenarios and --engine game, reuse up to this many scores of brains that already played their game"
+    )
+    add_run_arguments(train_parser, suppress_defaults = True)
+
+    islands_parser = subparsers.add_parser(
+        "islands", help = "train several populations at once, in their own processes, swapping their fittest brains now and then"
+    )
+    islands_parser.add_argument("--islands", type = int, default = 4, help = "how many populations, each in its own process (default: 4)")
+    islands_parser.add_argument("--generations", type = int, default = None, help = "stop after this many generations (default: run until Ctrl-C)")
+    islands_parser.add_argument("--population", type = int, default = training.POPULATION_SIZE, help = "brains per generation, per island")
+    islands_parser.add_argument(
+        "--engine", choices = list(training.ENGINES), default = "batch",
+        help = "play games all at once with BatchGame, or one Game object per brain"
+    )
+    islands_parser.add_argument("--migrate-every", type = int, default = 5, help = "send migrants every this many generations (default: 5)")
+    islands_parser.add_argument("--migrants", type = int, default = 4, help = "how many of its fittest brains an island sends (default: 4)")
+    islands_parser.add_argument(
+        "--transport", choices = ["queue", "tcp"], default = "queue",
+        help = "move migrants through multiprocessing queues, or over TCP, which also works across hosts"
+    )
+    islands_parser.add_argument("--port", type = int, default = 47000, help = "with --transport tcp, the first of the localhost ports islands listen on")
+    islands_parser.add_argument(
+        "--addresses", default = None,
+        help = "with --island, every island's host:port, comma separated, in island order, such as to run one island per host"
+    )
+    islands_parser.add_argument("--island", type = int, default = None, help = "run only this island, in this process, over TCP to the --addresses")
+    islands_parser.add_argument("--stats-file", default = None, help = "append each generation's stats as JSON lines to this file (default: stdout)")
+    islands_parser.add_argument("--seed", type = int, default = argparse.SUPPRESS, help = "seed the islands' random draws")
+
+    benchmark_parser = subparsers.add_parser("benchmark", help = "time the hot paths with fixed seeds, and print a JSON report")
+    benchmark_parser.add_argument("--output", default = None, help = "write the JSON report to this file (default: stdout)")
+    benchmark_parser.add_argument("--baseline", default = None, help = "compare against this earlier report, and fail if anything regressed")
+    benchmark_parser.add_argument(
+        "--tolerance", type = float, default = benchmark.DEFAULT_TOLERANCE,
+        help = "how much slower than the baseline, as a fraction, counts as a regression (default: 0.1)"
+    )
+    benchmark_parser.add_argument("--quick", action = "store_true", help = "skip the largest populations and buffalo counts")
+
+    arguments = argument_parser.parse_args()
+    if arguments.resume and not arguments.checkpoint:
+        argument_parser.error("--resume needs --checkpoint")
+    if arguments.command == "train" and arguments.fitness_cache and (arguments.engine != "game" or not arguments.scenarios):
+        argument_parser.error("--fitness-cache needs --scenarios and --engine game")
+
+    if arguments.command == "train":
+        stats_stream = open(arguments.stats_file, "a") if arguments.stats_file else sys.stdout
+        try:
+            training.train(
+                arguments.generations,
+                arguments.population,
+                arguments.engine,
+                arguments.processes,
+                stats_stream,
+                arguments.checkpoint,
+                arguments.checkpoint_every,
+                arguments.resume,
+                arguments.seed,
+                arguments.scenarios,
+                arguments.fitness_cache
+            )
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if stats_stream is not sys.stdout:
+                stats_stream.close()
+
+        return
+
+    if arguments.command == "islands":
+        island_arguments = {
+            "generations": arguments.generations,
+            "population_size": arguments.population,
+            "engine": arguments.engine,
+            "migrate_every": arguments.migrate_every,
+            "num_migrants": arguments.migrants,
+            "seed": arguments.seed,
+            "stats_path": arguments.stats_file,
+        }
+        if arguments.island is not None:
+            addresses = (
+                islands.parse_addresses(arguments.addresses) if arguments.addresses
+                    else islands.localhost_addresses(arguments.islands, arguments.port)
+            )
+            islands.run_island(
+                arguments.island, len(addresses), functools.partial(islands.TcpTransport, addresses), **island_arguments
+            )
+        else:
+            islands.run(arguments.islands, arguments.transport, arguments.port, **island_arguments)
+
+        return
+
+    if arguments.command == "benchmark":
+        if not benchmark.main(arguments.output, arguments.baseline, arguments.tolerance, arguments.quick):
+            sys.exit(1)
+
+        return
+
     pygame.init()
     screen = pygame.display.set_mode(gamex.SCREEN_SIZE)
+    executor = None
+    checkpointer = None
+    graph_renderer = None
 
     try:
         menu_choice = gamex.prompt_main_menu(screen)
@@ -32,7 +170,7 @@ def main():
 
                 render_tick()
 
-                def get_keys_pressed():
+                def get_action():
                     # Using peek and poll, instead of get, because we might return before processing the whole list.
                     while pygame.event.peek():
                         event = pygame.event.poll()
@@ -42,13 +180,13 @@ def main():
                                 raise gamex.Pygame_quit_exception()
 
                             case pygame.KEYDOWN | pygame.KEYUP:
-                                return pygame.key.get_pressed()
+                                return gamex.action_from_keys_pressed(pygame.key.get_pressed())
 
                     # Some key presses should fire only once, on the key down event,
                     # so if there's no key event waiting, then return all keys as not pressed.
-                    return [False for ascii_key_index in range(128)]
+                    return 0
 
-                while game.tick(get_keys_pressed()):
+                while game.tick(get_action()):
                     render_tick()
 
             case pygame.K_t:
@@ -58,14 +196,61 @@ def main():
                     SINGLE_WITH_GRAPH = 2
                     BRAIN_GRAPH = 3
                     GENERATION_SCORES = 4
-
-                brains = [ai.Brain().mutate() for _ in range(144)]
+                    PERFORMANCE = 5
+                    CHAMPION_REPLAY = 6
+
+                # Every random draw in the run, mutations and game seeds, comes from this one generator.
+                rng = numpy.random.default_rng(arguments.seed)
+                if arguments.resume:
+                    brains, generation_avg_stats = checkpoint.load(arguments.checkpoint, rng)
+                else:
+                    brains = ai.mutate_population([ai.Brain()], training.POPULATION_SIZE, rng)
+                    generation_avg_stats = []
+                checkpointer = checkpoint.Checkpointer(arguments.checkpoint, arguments.checkpoint_every, rng) if arguments.checkpoint else None
                 view = View.GALLERY
-                generation_avg_stats = []
+                executor = parallel.create_executor(arguments.processes) if arguments.processes > 1 else None
+                snapshot_queue = parallel.create_snapshot_queue() if executor else None
                 log_next_compute_to_stream = None
+                render_scheduler = scheduler.Scheduler(arguments.render_budget, arguments.gallery_tiles_per_frame)
+                brain_label_font = pygame.font.SysFont("monospace", 18)
+                graph_renderer = brain_graph.BrainGraphRenderer()
+
+                # The brain graph draws in the background. Until it's ready, show the last graph drawn, or a blank one.
+                def blit_graph(rect):
+                    graph = graph_renderer.graph(brains[single_view_selection["index"]], rect.size)
+                    if graph:
+                        screen.blit(graph, rect)
+                    else:
+                        screen.fill("white", rect)
+                # Each chart catches up on new generations' stats whenever it's shown.
+                stat_charts = {
+                    "score": chart.LineChart(gamex.SCREEN_SIZE, brain_label_font, "AVG GAME SCORE", "GENERATION"),
+                    "mutation_rate": chart.LineChart(gamex.SCREEN_SIZE, brain_label_font, "AVG BRAIN MUTATION", "GENERATION"),
+                }
+                phase_timers = profiling.PhaseTimers()
+                profile_next_generation = False
+                generation_profile = None
+                # Replays the last generation's highest scoring game from its recording, or None before the first generation ends.
+                champion_replay = None
+
+                def update_caption():
+                    # Worker processes tick their games on their own, at max speed, so the rate only applies without them.
+                    if executor:
+                        pygame.display.set_caption(f"Training: max speed, across {arguments.processes} processes")
+                        return
+
+                    ticks_per_second = render_scheduler.ticks_per_second()
+                    speed = "max speed" if ticks_per_second is None else f"{ticks_per_second} ticks/sec"
+                    pygame.display.set_caption(f"Training: {speed} (+/- to change)")
+
+                update_caption()
 
                 def process_pygame_events():
-                    nonlocal log_next_compute_to_stream, view
+                    with phase_timers.phase("events"):
+                        process_pygame_events_untimed()
+
+                def process_pygame_events_untimed():
+                    nonlocal log_next_compute_to_stream, view, profile_next_generation
 
                     for event in pygame.event.get():
                         match event.type:
@@ -77,16 +262,31 @@ def main():
                                 if keys_pressed[pygame.K_SPACE]:
                                     log_next_compute_to_stream = tempfile.NamedTemporaryFile(mode = "w", delete = False, suffix = ".txt")
                                 if keys_pressed[pygame.K_TAB]:
-                                    view = (view + 1) % 5 # 5 is the end enum value.
+                                    view = (view + 1) % 7 # 7 is the end enum value.
+                                if keys_pressed[pygame.K_p]:
+                                    profile_next_generation = True
+                                if keys_pressed[pygame.K_EQUALS] or keys_pressed[pygame.K_PLUS] or keys_pressed[pygame.K_KP_PLUS]:
+                                    render_scheduler.faster()
+                                    update_caption()
+                                if keys_pressed[pygame.K_MINUS] or keys_pressed[pygame.K_KP_MINUS]:
+                                    render_scheduler.slower()
+                                    update_caption()
 
                 while True:
-                    games = [gamex.Game() for _ in range(len(brains))]
+                    if profile_next_generation:
+                        generation_profile = cProfile.Profile()
+                        generation_profile.enable()
+                        profile_next_generation = False
+
+                    seeds = training.episode_seeds(rng, len(brains))
+                    games = [gamex.Game(seed, record = True) for seed in seeds]
+                    population = ai.Population(brains)
                     single_view_selection = None
 
                     def render_tick():
                         # Switching to the best performing game every frame can be jarring.
                         # Whichever game we show in single view, stay with it for a while.
-                        nonlocal single_view_selection
+                        nonlocal single_view_selection, champion_replay
                         if (
                             not single_view_selection
                             or (datetime.now() - single_view_selection["selected_on"]) > timedelta(seconds = 10)
@@ -95,20 +295,8 @@ def main():
                                 range(len(games)), key = lambda index: games[index].score, reverse = True
                             )[0]
 
-                            def render_graph_lazy_memoize():
-                                if not single_view_selection["_graph_cache"]:
-                                    single_view_selection["_graph_cache"] = brains[highest_scoring_game_index].render()
-
-                                    # We just finished rendering the brain graph. Reset the clock so we stick with it for a while.
-                                    single_view_selection["selected_on"] = datetime.now()
-
-                                return single_view_selection["_graph_cache"]
-
                             single_view_selection = {
                                 "index": highest_scoring_game_index,
-                                "game": games[highest_scoring_game_index],
-                                "graph": render_graph_lazy_memoize,
-                                "_graph_cache": None,
                                 "selected_on": datetime.now()
                             }
 
@@ -116,73 +304,92 @@ def main():
                             case View.GALLERY:
                                 num_brains_sqrt = math.ceil(len(brains) ** 0.5)
 
-                                for game, index in zip(games, range(len(games))):
-                                    frame = game.render()
-                                    scaled_width, scaled_height = (frame.get_width() // num_brains_sqrt, frame.get_height() // num_brains_sqrt)
-                                    scaled_frame = pygame.transform.smoothscale(frame, (scaled_width, scaled_height))
-                                    screen.blit(scaled_frame, (index % num_brains_sqrt * scaled_width, index // num_brains_sqrt * scaled_height))
+                                # Only redraw some of the tiles each frame. The rest keep showing their last frame.
+                                # Each game draws straight into its tile, already scaled down, rather than rendering at full size
+                                # and then shrinking the frame.
+                                scaled_width, scaled_height = (screen.get_width() // num_brains_sqrt, screen.get_height() // num_brains_sqrt)
+                                for index in render_scheduler.next_gallery_tiles(len(games)):
+                                    tile_surface = screen.subsurface(pygame.Rect(
+                                        index % num_brains_sqrt * scaled_width, index // num_brains_sqrt * scaled_height, scaled_width, scaled_height
+                                    ))
+                                    games[index].render(tile_surface, 1 / num_brains_sqrt)
 
                                     # Rendering takes time. We need to check pygame events each iteration of this render loop
                                     # or the app won't be responsive enough.
                                     process_pygame_events()
 
                             case View.SINGLE | View.SINGLE_WITH_GRAPH:
-                                frame = single_view_selection["game"].render()
+                                # Look the game up each frame. With worker processes, snapshots replace the game objects.
+                                frame = games[single_view_selection["index"]].render()
                                 screen.blit(frame, (0, 0))
 
-                                text = pygame.font.SysFont("monospace", 18).render(
+                                text = brain_label_font.render(
                                     f"BRAIN: {single_view_selection["index"] + 1} (Gen {len(generation_avg_stats) + 1})", False, "white"
                                 )
                                 screen.blit(text, (screen.get_width() - 16 - text.get_width(), 10))
 
                                 if view == View.SINGLE_WITH_GRAPH:
-                                    graph = single_view_selection["graph"]()
-                                    graph_scaled = pygame.transform.smoothscale(
-                                        graph, (300, 300 * graph.get_height() // graph.get_width())
-                                    )
-                                    screen.blit(graph_scaled, (screen.get_width() - graph_scaled.get_width() - 20, 40))
+                                    graph_rect = pygame.Rect(0, 0, 300, 300 * gamex.MAIN_SURFACE_SIZE[1] // gamex.MAIN_SURFACE_SIZE[0])
+                                    graph_rect.topright = (screen.get_width() - 20, 40)
+                                    blit_graph(graph_rect)
 
                             case View.BRAIN_GRAPH:
-                                graph_scaled = pygame.transform.smoothscale(
-                                    single_view_selection["graph"](), (screen.get_width(), screen.get_height())
-                                )
-                                screen.blit(graph_scaled, (0, 0))
+                                blit_graph(screen.get_rect())
 
                             case View.GENERATION_SCORES:
-                                figure = matplotlib.pyplot.figure(figsize = (9.6, 5.4), layout = "constrained")
-
                                 # Flip between two graphs, and stay on each one for about 10 seconds.
-                                if datetime.now().second // 10 % 2 == 0:
-                                    matplotlib.pyplot.plot([avg_stat["score"] for avg_stat in generation_avg_stats])
-                                    matplotlib.pyplot.ylabel("AVG GAME SCORE")
+                                stat_name = "score" if datetime.now().second // 10 % 2 == 0 else "mutation_rate"
+                                stat_chart = stat_charts[stat_name]
+                                for avg_stat in generation_avg_stats[stat_chart.num_values:]:
+                                    stat_chart.append(avg_stat[stat_name])
+                                stat_chart.render(screen)
+
+                            case View.CHAMPION_REPLAY:
+                                if champion_replay:
+                                    # Replay at game speed, whatever speed training runs at, and start over when it ends.
+                                    champion_replay.catch_up()
+                                    if champion_replay.done():
+                                        champion_replay = replay.Replay(champion_replay.recording)
+                                    screen.blit(champion_replay.game.render(), (0, 0))
+
+                                    text = brain_label_font.render(f"REPLAY: CHAMPION OF GEN {len(generation_avg_stats)}", False, "white")
+                                    screen.blit(text, (screen.get_width() - 16 - text.get_width(), 10))
                                 else:
-                                    matplotlib.pyplot.plot([avg_stat["mutation_rate"] for avg_stat in generation_avg_stats])
-                                    matplotlib.pyplot.ylabel("AVG BRAIN MUTATION")
-
-                                matplotlib.pyplot.xlabel("GENERATION")
-                                figure_canvas = matplotlib.backends.backend_agg.FigureCanvas(figure)
-                                figure_canvas.draw()
-                                matplotlib.pyplot.close(figure)
-
-                                surface = pygame.image.frombuffer(
-                                    figure_canvas.get_renderer().buffer_rgba(),
-                                    (int(figure_canvas.get_renderer().width), int(figure_canvas.get_renderer().height)),
-                                    "RGBA"
-                                )
-                                surface_scaled = pygame.transform.smoothscale(surface, (screen.get_width(), screen.get_height()))
-                                screen.blit(surface_scaled, (0, 0))
+                                    screen.fill("black")
+                                    text = brain_label_font.render("THE LAST GENERATION'S CHAMPION WILL REPLAY HERE", False, "white")
+                                    screen.blit(text, (16, 10))
+
+                            case View.PERFORMANCE:
+                                screen.fill("black")
+
+                                if generation_profile:
+                                    profile_status = "PROFILING THIS GENERATION..."
+                                elif profile_next_generation:
+                                    profile_status = "WILL PROFILE NEXT GENERATION"
+                                else:
+                                    profile_status = "PRESS P TO PROFILE NEXT GENERATION"
+                                lines = [f"PERFORMANCE (Gen {len(generation_avg_stats) + 1}) {profile_status}", ""] + phase_timers.report_lines()
+                                for line_index, line in enumerate(lines):
+                                    screen.blit(brain_label_font.render(line, False, "white"), (16, 10 + line_index * 22))
 
                         pygame.display.flip()
 
-                    render_tick()
-                    last_render_time = datetime.now()
+                    def render_tick_if_scheduled():
+                        if render_scheduler.should_render():
+                            with phase_timers.phase("render"):
+                                render_scheduler.render_started()
+                                render_tick()
+                                render_scheduler.render_finished()
 
-                    def get_keys_pressed(game, brain):
-                        nonlocal log_next_compute_to_stream
+                    render_tick_if_scheduled()
 
-                        next_move_keys = brain.compute_next_move(game, log_next_compute_to_stream)
+                    def dump_next_compute():
+                        nonlocal log_next_compute_to_stream
 
                         if log_next_compute_to_stream:
+                            # The batched compute doesn't log, so dump the first brain's compute on its own.
+                            brains[0].compute_next_move(games[0], log_next_compute_to_stream)
+
                             # `startfile` for Windows, `open` for all else.
                             if hasattr(os, "startfile"):
                                 os.startfile(log_next_compute_to_stream.name)
@@ -190,40 +397,113 @@ def main():
                                 subprocess.run(["open", log_next_compute_to_stream.name])
                             log_next_compute_to_stream = False
 
-                        return [
-                            next_move_keys[ascii_key_index] if ascii_key_index in next_move_keys else False
-                                for ascii_key_index in range(128)
-                        ]
-
-                    while any(list(map(
-                        lambda game_brain: game_brain[0].tick(get_keys_pressed(game_brain[0], game_brain[1])),
-                        zip(games, brains)
-                    ))):
-                        # Rendering is a performance bottleneck. The less we render, the faster we compute.
-                        if (datetime.now() - last_render_time) >= timedelta(milliseconds = 250):
-                            render_tick()
-                            last_render_time = datetime.now()
-
-                        process_pygame_events()
-
-                    generation_avg_stats.append({
-                        "score": sum(map(lambda game: game.score, games)) / len(games),
-                        "mutation_rate": sum(map(lambda brain: brain._probability_of_mutation, brains)) / len(brains)
-                    })
-
-                    brains_scores = [(brain, game.score) for game, brain in zip(games, brains)]
-                    brains_scores_sorted = sorted(brains_scores, key = lambda brain_score: brain_score[1], reverse = True)
-                    fittest_cutoff = len(brains_scores_sorted) // 2
-                    brains = [
-                        brains_scores_sorted[index % fittest_cutoff][0].mutate()
-                            for index in range(len(brains))
-                    ]
+                    def tick_games():
+                        dump_next_compute()
+
+                        with phase_timers.phase("inputs"):
+                            input_values = ai.compute_games_input_values(games)
+                        with phase_timers.phase("inference"):
+                            next_moves = population.compute_next_moves(input_values)
+                        with phase_timers.phase("tick"):
+                            phase_timers.ticks += 1
+                            return any([game.tick(action) for game, action in zip(games, gamex.actions_from_moves(next_moves))])
+
+                    if executor:
+                        # Workers play the real games. The local games are only for display, replaced by snapshots as they arrive.
+                        generation_futures = parallel.submit_generation(
+                            executor,
+                            brains,
+                            arguments.processes,
+                            snapshot_queue,
+                            seeds = seeds,
+                            record = True
+                        )
+                        while not all(future.done() for future in generation_futures):
+                            parallel.drain_snapshots(snapshot_queue, games)
+                            dump_next_compute()
+
+                            render_tick_if_scheduled()
+                            process_pygame_events()
+                            with phase_timers.phase("wait"):
+                                pygame.time.wait(10)
+
+                        parallel.drain_snapshots(snapshot_queue, games)
+                        scores = parallel.generation_scores(generation_futures)
+                        # The workers did the ticking. Their snapshots say how far they got.
+                        phase_timers.ticks = max(game.ticks for game in games)
+                    else:
+                        def render_and_process_events():
+                            # Rendering is a performance bottleneck. The scheduler caps how much of our time it takes.
+                            render_tick_if_scheduled()
+                            process_pygame_events()
+
+                        while tick_games():
+                            render_and_process_events()
+                            with phase_timers.phase("wait"):
+                                render_scheduler.wait_for_next_tick(render_and_process_events)
+
+                        scores = [game.score for game in games]
+
+                    generation_avg_stats.append(training.generation_stats(brains, scores))
+
+                    # With worker processes, the games are the workers' final snapshots, recordings and all.
+                    champion_index = max(range(len(scores)), key = lambda index: scores[index])
+                    champion_replay = replay.Replay(replay.Recording.of_game(games[champion_index]))
+                    with phase_timers.phase("mutate"):
+                        brains = training.next_generation(brains, scores, rng)
+                    if checkpointer:
+                        with phase_timers.phase("checkpoint"):
+                            checkpointer.generation_finished(brains, generation_avg_stats)
+                    phase_timers.generation_finished()
+
+                    if generation_profile:
+                        generation_profile.disable()
+
+                        # Dump both the raw profile, for tools like snakeviz, and a readable report, which we open.
+                        profile_stats_file = tempfile.NamedTemporaryFile(mode = "w", delete = False, suffix = ".txt")
+                        generation_profile.dump_stats(profile_stats_file.name.removesuffix(".txt") + ".prof")
+                        pstats.Stats(generation_profile, stream = profile_stats_file).sort_stats(pstats.SortKey.CUMULATIVE).print_stats()
+                        profile_stats_file.close()
+                        generation_profile = None
+
+                        # `startfile` for Windows, `open` for all else.
+                        if hasattr(os, "startfile"):
+                            os.startfile(profile_stats_file.name)
+                        else:
+                            subprocess.run(["open", profile_stats_file.name])
 
     except gamex.Pygame_quit_exception:
         pass
 
-# Normal run.
-main()
+    finally:
+        if executor:
+            executor.shutdown(wait = False, cancel_futures = True)
+        if checkpointer:
+            checkpointer.close()
+        if graph_renderer:
+            graph_renderer.close()
+
+# Options for both the training window and the `train` command. They go on the top level parser, with their defaults,
+# and again on the subcommand, with no defaults, so they work before or after the subcommand's name, and a subcommand's
+# defaults never overwrite values given before it.
+def add_run_arguments(parser, suppress_defaults = False):
+    def default(value):
+        return argparse.SUPPRESS if suppress_defaults else value
+
+    parser.add_argument(
+        "--processes", type = int, default = default(1),
+        help = "when training, play each generation's games across this many worker processes"
+    )
+    parser.add_argument("--checkpoint", default = default(None), help = "when training, save the population to this .npz file as it goes")
+    parser.add_argument(
+        "--checkpoint-every", type = int, default = default(1), help = "save a checkpoint every this many generations (default: 1)"
+    )
+    parser.add_argument("--resume", action = "store_true", default = default(False), help = "continue training from the --checkpoint file")
+    parser.add_argument("--seed", type = int, default = default(None), help = "seed training's random draws, to reproduce a run")
+
+# Normal run. Guarded, because worker processes import this module too.
+if __name__ == "__main__":
+    main()
 
 # Profile run.
 # cProfile.run("main()", sort = pstats.SortKey.CUMULATIVE)
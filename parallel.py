@@ -0,0 +1,76 @@
+import ai
+import game as gamex
+
+import concurrent.futures
+import multiprocessing
+import numpy
+import queue
+
+# How often, in game ticks, a worker sends copies of its games back for display.
+SNAPSHOT_EVERY_TICKS = 15
+
+# Workers are started with "spawn" rather than "fork", so they don't inherit the parent's pygame display.
+_mp_context = multiprocessing.get_context("spawn")
+
+def create_executor(processes):
+    return concurrent.futures.ProcessPoolExecutor(max_workers = processes, mp_context = _mp_context)
+
+# A queue workers can share with the parent, for `play_episodes` snapshots.
+def create_snapshot_queue():
+    return _mp_context.Manager().Queue()
+
+# Runs in a worker process. Plays one whole game per brain, all in lockstep, to `GAME_MAX_TICKS`,
+# and returns only the scores. If given a queue, every `SNAPSHOT_EVERY_TICKS` it also puts
+# (population index, game) pairs, where `first_index` is the population index of `brains[0]`.
+# If given seeds, one per brain, they seed the games, so the same brains and seeds always score the same.
+# If `record` is True, the games record their actions, so the snapshots can be replayed. See `replay.Recording`.
+def play_episodes(brains, first_index = 0, snapshot_queue = None, seeds = None, record = False):
+    games = [gamex.Game(seed, record) for seed in (seeds if seeds is not None else [None] * len(brains))]
+    population = ai.Population(brains)
+
+    while True:
+        actions = gamex.actions_from_moves(population.compute_next_moves(ai.compute_games_input_values(games)))
+        if not any([game.tick(action) for game, action in zip(games, actions)]):
+            break
+
+        if snapshot_queue is not None and games[0].ticks % SNAPSHOT_EVERY_TICKS == 0:
+            for index, game in enumerate(games, first_index):
+                snapshot_queue.put((index, game))
+
+    if snapshot_queue is not None:
+        for index, game in enumerate(games, first_index):
+            snapshot_queue.put((index, game))
+
+    return [game.score for game in games]
+
+# Splits the population into contiguous shards, one per worker, and returns a future per shard.
+# Each future's result is its shard's scores, so concatenating them in order gives the whole population's scores.
+# `play_episodes` is any module-level function with the same signature as this module's `play_episodes`.
+def submit_generation(executor, brains, num_shards, snapshot_queue = None, play_episodes = play_episodes, seeds = None, record = False):
+    shards_bounds = numpy.linspace(0, len(brains), num_shards + 1).astype(int)
+
+    return [
+        executor.submit(
+            play_episodes,
+            brains[shard_begin:shard_end],
+            shard_begin,
+            snapshot_queue,
+            seeds[shard_begin:shard_end] if seeds is not None else None,
+            record
+        )
+            for shard_begin, shard_end in zip(shards_bounds[:-1], shards_bounds[1:])
+            if shard_end > shard_begin
+    ]
+
+def generation_scores(generation_futures):
+    return [score for future in generation_futures for score in future.result()]
+
+# Applies whatever snapshots have arrived so far to `games`, without waiting for more.
+def drain_snapshots(snapshot_queue, games):
+    while True:
+        try:
+            index, game = snapshot_queue.get_nowait()
+        except queue.Empty:
+            return
+
+        games[index] = game
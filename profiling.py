@@ -0,0 +1,69 @@
+import contextlib
+import time
+
+# Wall time spent in each phase of training, such as ticking games or rendering, summed per generation.
+# Phases can nest, such as checking events partway through rendering. Time is only ever charged to the
+# innermost phase running, so the phases add up to no more than the generation's wall time.
+class PhaseTimers:
+    def __init__(self):
+        # Phase name -> seconds, for the generation in progress.
+        self.seconds = {}
+        self.ticks = 0
+        self.generation_started = time.perf_counter()
+
+        # The same stats for the last whole generation, or None before the first one finishes.
+        self.last_generation = None
+
+        self._running_phases = []
+        self._charged_until = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self._charge_running_phase()
+        self._running_phases.append(name)
+        try:
+            yield
+        finally:
+            self._charge_running_phase()
+            self._running_phases.pop()
+
+    def _charge_running_phase(self):
+        now = time.perf_counter()
+        if self._running_phases:
+            name = self._running_phases[-1]
+            self.seconds[name] = self.seconds.get(name, 0) + now - self._charged_until
+        self._charged_until = now
+
+    def generation_finished(self):
+        now = time.perf_counter()
+        self.last_generation = self._stats(now)
+        self.seconds = {}
+        self.ticks = 0
+        self.generation_started = now
+
+    def _stats(self, now):
+        return {
+            "seconds": now - self.generation_started,
+            "ticks": self.ticks,
+            "phases": dict(self.seconds),
+        }
+
+    # Text lines for the generation in progress and, if there is one, the last whole generation.
+    def report_lines(self):
+        lines = []
+        for title, stats in [("THIS GENERATION, SO FAR", self._stats(time.perf_counter())), ("LAST GENERATION", self.last_generation)]:
+            if not stats:
+                continue
+
+            ticks_per_second = stats["ticks"] / stats["seconds"] if stats["seconds"] else 0
+            lines.append(f"{title}: {stats["seconds"]:.2f} s wall, {stats["ticks"]} ticks, {ticks_per_second:.1f} ticks/sec")
+            lines.append(f"    {"PHASE":12} {"MS TOTAL":>10} {"MS/TICK":>10} {"SHARE":>7}")
+            for name, seconds in sorted(stats["phases"].items(), key = lambda name_seconds: name_seconds[1], reverse = True):
+                ms_per_tick = seconds * 1000 / stats["ticks"] if stats["ticks"] else 0
+                share = seconds / stats["seconds"] if stats["seconds"] else 0
+                lines.append(f"    {name:12} {seconds * 1000:10.1f} {ms_per_tick:10.3f} {share:7.1%}")
+            untimed_seconds = stats["seconds"] - sum(stats["phases"].values())
+            lines.append(f"    {"(untimed)":12} {untimed_seconds * 1000:10.1f}")
+            lines.append("")
+
+        return lines
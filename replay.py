@@ -0,0 +1,59 @@
+import game as gamex
+
+import time
+
+# A recorded episode: the game's seed, and the action it was given each tick, one byte per tick, about 900 bytes
+# in all. Every random draw a `Game` makes comes from its seed, so replaying the actions reproduces the episode
+# exactly, without the brain that chose them.
+class Recording:
+    # Seeds are up to 128 bits, the size of `numpy.random.SeedSequence().entropy`.
+    SEED_BYTES = 16
+
+    def __init__(self, seed, actions):
+        self.seed = seed
+        self.actions = bytes(actions)
+
+    # Recordings are only made by games created with `record = True`.
+    @staticmethod
+    def of_game(game):
+        return Recording(game.seed, game.recorded_actions)
+
+    def to_bytes(self):
+        return self.seed.to_bytes(Recording.SEED_BYTES, "little") + self.actions
+
+    @staticmethod
+    def from_bytes(data):
+        return Recording(int.from_bytes(data[:Recording.SEED_BYTES], "little"), data[Recording.SEED_BYTES:])
+
+# Re-simulates a recording from its first tick. Step through it headless, as fast as you like, or let it keep
+# pace with the wall clock, at any rate, and render `game` as it goes.
+class Replay:
+    def __init__(self, recording, ticks_per_second = 15):
+        self.recording = recording
+        self.ticks_per_second = ticks_per_second
+        self.game = gamex.Game(recording.seed)
+        self.started = time.perf_counter()
+
+    def done(self):
+        return self.game.ticks >= len(self.recording.actions)
+
+    # Plays up to `num_ticks` more ticks. Returns False once the recording has run out.
+    def step(self, num_ticks = 1):
+        for _ in range(num_ticks):
+            if self.done():
+                return False
+            self.game.tick(self.recording.actions[self.game.ticks])
+
+        return not self.done()
+
+    # Plays however many ticks are due at `ticks_per_second` since the replay started.
+    def catch_up(self):
+        ticks_due = int((time.perf_counter() - self.started) * self.ticks_per_second)
+        self.step(ticks_due - self.game.ticks)
+
+# Replays the whole recording, headless, and returns the game as it ended.
+def replay(recording):
+    game_replay = Replay(recording)
+    game_replay.step(len(recording.actions))
+
+    return game_replay.game
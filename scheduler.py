@@ -0,0 +1,73 @@
+import time
+
+# Decouples simulation from display in the training view. The simulation ticks at a chosen rate, or as fast as
+# it can, and frames are only drawn when rendering's share of wall time is under budget. The gallery redraws
+# a bounded number of its tiles per frame, round-robin, so a frame never stalls the simulation for long.
+class Scheduler:
+    # Simulation rates to step through, in ticks per second. None is max speed.
+    TICKS_PER_SECOND_CHOICES = [1, 5, 15, 30, 60, 120, None]
+
+    # Never draw frames faster than this, even if rendering is cheap.
+    MIN_FRAME_SECONDS = 1 / 30
+
+    # The longest single sleep while waiting for the next tick.
+    WAIT_SLICE_SECONDS = 1 / 60
+
+    def __init__(self, render_budget = 0.2, max_gallery_tiles_per_frame = 36):
+        # Fraction of wall time that rendering may use, between 0 and 1.
+        self.render_budget = render_budget
+        self.max_gallery_tiles_per_frame = max_gallery_tiles_per_frame
+
+        self._ticks_per_second_index = len(Scheduler.TICKS_PER_SECOND_CHOICES) - 1
+        self._next_tick_time = time.perf_counter()
+        self._next_render_time = 0
+        self._render_started = None
+        self._next_gallery_tile = 0
+
+    def ticks_per_second(self):
+        return Scheduler.TICKS_PER_SECOND_CHOICES[self._ticks_per_second_index]
+
+    def faster(self):
+        self._ticks_per_second_index = min(self._ticks_per_second_index + 1, len(Scheduler.TICKS_PER_SECOND_CHOICES) - 1)
+
+    def slower(self):
+        self._ticks_per_second_index = max(self._ticks_per_second_index - 1, 0)
+
+    # Call once per simulation tick. Waits as long as needed to hold the chosen rate, in short sleeps, calling
+    # `while_waiting` between them, so events and frames at slow rates aren't stuck behind one long sleep.
+    def wait_for_next_tick(self, while_waiting = None):
+        now = time.perf_counter()
+        ticks_per_second = self.ticks_per_second()
+        if ticks_per_second is None:
+            self._next_tick_time = now
+            return
+
+        # If we've fallen behind, such as after a slow frame, don't rush to catch up.
+        self._next_tick_time = max(self._next_tick_time + 1 / ticks_per_second, now)
+        while now < self._next_tick_time:
+            if while_waiting:
+                while_waiting()
+            now = time.perf_counter()
+            time.sleep(max(0, min(self._next_tick_time - now, Scheduler.WAIT_SLICE_SECONDS)))
+            now = time.perf_counter()
+
+    def should_render(self):
+        return time.perf_counter() >= self._next_render_time
+
+    def render_started(self):
+        self._render_started = time.perf_counter()
+
+    # Schedules the next frame far enough out that this frame's render time is at most `render_budget` of the total.
+    def render_finished(self):
+        now = time.perf_counter()
+        render_seconds = now - self._render_started
+        idle_seconds = render_seconds * (1 - self.render_budget) / self.render_budget
+        self._next_render_time = self._render_started + max(Scheduler.MIN_FRAME_SECONDS, render_seconds + idle_seconds)
+
+    # The gallery tile indices to redraw this frame, picking up where the last frame left off.
+    def next_gallery_tiles(self, num_tiles):
+        num_tiles_this_frame = min(num_tiles, self.max_gallery_tiles_per_frame)
+        tiles = [(self._next_gallery_tile + offset) % num_tiles for offset in range(num_tiles_this_frame)]
+        self._next_gallery_tile = (self._next_gallery_tile + num_tiles_this_frame) % num_tiles
+
+        return tiles
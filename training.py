@@ -0,0 +1,166 @@
+import ai
+import batch_game
+import checkpoint
+import fitness_cache as fitness_cachex
+import parallel
+
+import json
+import numpy
+import sys
+import time
+
+POPULATION_SIZE = 144
+
+# Plays one whole game per brain with a `BatchGame`, and returns the scores. Same signature as
+# `parallel.play_episodes`, so either can play a shard in a worker process, but there are no `Game`
+# objects to snapshot, so the queue is ignored. The seeds together seed the one generator the whole batch shares.
+# Nor can a batch's games be replayed by a `Game`, so there's nothing to record either.
+def play_batch_episodes(brains, first_index = 0, snapshot_queue = None, seeds = None, record = False):
+    games = batch_game.BatchGame(len(brains), numpy.random.default_rng(seeds) if seeds is not None else None)
+    population = ai.Population(brains)
+
+    while games.tick(population.compute_next_moves(ai.compute_batch_input_values(games))):
+        pass
+
+    return games.scores.tolist()
+
+# How to play a generation's games, by `--engine` name.
+ENGINES = {
+    "batch": play_batch_episodes,
+    "game": parallel.play_episodes,
+}
+
+def generation_stats(brains, scores):
+    return {
+        "score": sum(scores) / len(scores),
+        "mutation_rate": sum(map(lambda brain: brain._probability_of_mutation, brains)) / len(brains)
+    }
+
+# One game seed per brain, drawn from the training run's generator. Since checkpoints save that generator's state,
+# a resumed run plays the same games it would have if it had never stopped.
+def episode_seeds(rng, n):
+    return rng.integers(2 ** 63, size = n).tolist()
+
+# A fixed set of `num_scenarios` game seeds, to play every generation rather than fresh games. Drawn from `seed`,
+# not the training run's generator, so the run draws the same mutations with or without scenarios, and a resumed
+# run with the same seed plays the same scenarios.
+def scenario_seeds(num_scenarios, seed = None):
+    return episode_seeds(numpy.random.default_rng(numpy.random.SeedSequence(seed).spawn(1)[0]), num_scenarios)
+
+# The scenario each brain plays, picked by its weights, so a brain plays the same game every generation it
+# survives, and every copy of it plays that game too. Copies are what `FitnessCache` saves replaying.
+def brains_scenario_seeds(genome_hashes, scenarios):
+    return [scenarios[int.from_bytes(genome_hash[:8], "little") % len(scenarios)] for genome_hash in genome_hashes]
+
+# Plays each distinct (weights, seed) pair that isn't in `fitness_cache` once, with `play(brains, seeds)`, caches
+# their scores, and fills in every other score from the cache, or from the copy of the brain that played. Returns the
+# scores and how many games were played.
+def cached_scores(play, brains, seeds, fitness_cache):
+    keys = [(fitness_cachex.FitnessCache.genome_hash(brain), seed) for brain, seed in zip(brains, seeds)]
+    # Each distinct key's score, or None if it isn't cached.
+    keys_scores = {key: fitness_cache.get(*key) for key in dict.fromkeys(keys)}
+    uncached_keys = [key for key, score in keys_scores.items() if score is None]
+
+    if uncached_keys:
+        # Brains with the same key play the same, whichever of them plays.
+        keys_brains = dict(zip(keys, brains))
+        played_scores = play([keys_brains[key] for key in uncached_keys], [seed for genome_hash, seed in uncached_keys])
+        for key, score in zip(uncached_keys, played_scores):
+            keys_scores[key] = score
+            fitness_cache.put(*key, score)
+
+    return [keys_scores[key] for key in keys], len(uncached_keys)
+
+# How many of a generation's brains are kept to parent the next one.
+def num_fittest(population_size):
+    return population_size // 2
+
+# Keep the fittest half, and refill the population with their mutated children.
+def next_generation(brains, scores, rng = None):
+    brains_scores = list(zip(brains, scores))
+    brains_scores_sorted = sorted(brains_scores, key = lambda brain_score: brain_score[1], reverse = True)
+    fittest_cutoff = num_fittest(len(brains_scores_sorted))
+
+    return ai.mutate_population([brain for brain, score in brains_scores_sorted[:fittest_cutoff]], len(brains), rng)
+
+# The same selection and mutation loop as the training view in `main.py`, but with no window, no rendering,
+# and no event polling. Writes one JSON line of stats per generation to `stats_stream`.
+# Runs until `generations` generations have been played, or forever if None, and returns the last generation's brains.
+# With `checkpoint_path`, saves a checkpoint every `checkpoint_every` generations, and with `resume`,
+# continues from that checkpoint, in which case `population_size` is ignored. With a `seed`, runs are reproducible.
+# With `num_scenarios`, brains play one of that many fixed games rather than a fresh one each generation, and with
+# `fitness_cache_size` too, scores of brains that already played their game are reused, up to that many.
+# The cache needs the "game" engine. See `FitnessCache`.
+def train(
+    generations = None,
+    population_size = POPULATION_SIZE,
+    engine = "batch",
+    processes = 1,
+    stats_stream = sys.stdout,
+    checkpoint_path = None,
+    checkpoint_every = 1,
+    resume = False,
+    seed = None,
+    num_scenarios = None,
+    fitness_cache_size = 0
+):
+    if fitness_cache_size and (engine != "game" or not num_scenarios):
+        raise ValueError("a fitness cache needs the game engine and a set of scenarios")
+
+    # Every random draw in the run, mutations and game seeds, comes from this one generator.
+    rng = numpy.random.default_rng(seed)
+    if resume:
+        brains, generation_avg_stats = checkpoint.load(checkpoint_path, rng)
+    else:
+        brains = ai.mutate_population([ai.Brain()], population_size, rng)
+        generation_avg_stats = []
+    play_episodes = ENGINES[engine]
+    executor = parallel.create_executor(processes) if processes > 1 else None
+    checkpointer = checkpoint.Checkpointer(checkpoint_path, checkpoint_every, rng) if checkpoint_path else None
+    scenarios = scenario_seeds(num_scenarios, seed) if num_scenarios else None
+    fitness_cache = fitness_cachex.FitnessCache(fitness_cache_size) if fitness_cache_size else None
+
+    def play(brains, seeds):
+        if executor:
+            return parallel.generation_scores(parallel.submit_generation(executor, brains, processes, play_episodes = play_episodes, seeds = seeds))
+
+        return play_episodes(brains, seeds = seeds)
+
+    try:
+        generation = len(generation_avg_stats)
+        while generations is None or generation < generations:
+            generation_started = time.perf_counter()
+            if scenarios:
+                seeds = brains_scenario_seeds([fitness_cachex.FitnessCache.genome_hash(brain) for brain in brains], scenarios)
+            else:
+                seeds = episode_seeds(rng, len(brains))
+
+            if fitness_cache is not None:
+                scores, games_played = cached_scores(play, brains, seeds, fitness_cache)
+            else:
+                scores = play(brains, seeds)
+
+            generation += 1
+            generation_avg_stats.append(generation_stats(brains, scores))
+            print(json.dumps({
+                "generation": generation,
+                **generation_avg_stats[-1],
+                "best_score": max(scores),
+                **({
+                    "games_played": games_played,
+                    "fitness_cache_hit_rate": round(fitness_cache.hit_rate(), 3),
+                } if fitness_cache is not None else {}),
+                "seconds": round(time.perf_counter() - generation_started, 3),
+            }), file = stats_stream, flush = True)
+
+            brains = next_generation(brains, scores, rng)
+            if checkpointer:
+                checkpointer.generation_finished(brains, generation_avg_stats)
+
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures = True)
+        if checkpointer:
+            checkpointer.close()
+
+    return brains